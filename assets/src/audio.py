@@ -0,0 +1,133 @@
+import os
+import time
+import wave
+import pygame
+from assets.src.config import AUDIO_FREQ, AUDIO_BUFFER, AUDIO_VOICES
+
+# SFX playback with a fixed pool of channels.
+# - pre_init() has to run before pygame.init(), otherwise pygame.init()
+#   opens the mixer with its default (big) buffer and ours is ignored.
+# - mp3s are decoded once and cached next to them as WAV (PCM), later
+#   startups just read the WAV back.
+# - play() never waits for a free channel: if all are busy it steals the
+#   oldest voice of the lowest priority, or drops the new sound if
+#   everything playing matters more.
+
+CACHE_DIR = "assets/audio/cache"
+
+
+def pre_init():
+    pygame.mixer.pre_init(AUDIO_FREQ, -16, 2, AUDIO_BUFFER)
+
+
+def pcm_path(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, name + ".wav")
+
+
+def load_pcm(path):
+    """
+    Sound for `path`, from the decoded WAV cache when it's up to date
+    (decodes the mp3 and writes the cache otherwise).
+    """
+    cached = pcm_path(path)
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        return pygame.mixer.Sound(cached)
+
+    sound = pygame.mixer.Sound(path)
+    freq, size, channels = pygame.mixer.get_init()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = cached + ".tmp"
+    with wave.open(tmp, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(abs(size) // 8)
+        f.setframerate(freq)
+        f.writeframes(sound.get_raw())
+    os.replace(tmp, cached)
+    return sound
+
+
+class AudioManager:
+    """
+    Named SFX + a bounded voice pool.
+      load(name, path, volume, priority, max_voices)  (thread-safe enough for the loader)
+      play(name, priority=None)  -> Channel, or None if it was dropped
+    max_voices caps how many copies of one sound overlap, so a crowd of hits
+    can't take every channel.
+    """
+    def __init__(self, voices=AUDIO_VOICES, enabled=True):
+        self.enabled = enabled and pygame.mixer.get_init() is not None
+        self.sounds = {}   # name -> (Sound, priority, max_voices)
+        self.channels = []
+        self.voice_sound = []     # per channel: name of what it's playing
+        self.voice_priority = []
+        self.voice_start = []
+        self.stolen = 0
+        self.dropped = 0
+        if self.enabled:
+            pygame.mixer.set_num_channels(voices)
+            self.channels = [pygame.mixer.Channel(i) for i in range(voices)]
+            self.voice_sound = [None] * voices
+            self.voice_priority = [0] * voices
+            self.voice_start = [0.0] * voices
+
+    def load(self, name, path, volume=1.0, priority=1, max_voices=4):
+        if not self.enabled:
+            return None
+        sound = load_pcm(path)
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, priority, max_voices)
+        return sound
+
+    def _pick(self, name, priority, max_voices):
+        # -> channel index to play on, or -1 to drop
+        free = -1
+        same = 0
+        same_victim = -1   # our own copy to restart: lowest priority, then oldest
+        victim = -1
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                if free < 0:
+                    free = i
+                continue
+            if self.voice_sound[i] == name:
+                same += 1
+                if self.voice_priority[i] <= priority and (
+                        same_victim < 0 or (self.voice_priority[i], self.voice_start[i]) <
+                        (self.voice_priority[same_victim], self.voice_start[same_victim])):
+                    same_victim = i
+            if victim < 0 or (self.voice_priority[i], self.voice_start[i]) < \
+                    (self.voice_priority[victim], self.voice_start[victim]):
+                victim = i
+
+        if same >= max_voices:
+            # restart one of our own copies, never a more important one
+            return same_victim
+        if free >= 0:
+            return free
+        if victim >= 0 and self.voice_priority[victim] <= priority:
+            return victim
+        return -1
+
+    def play(self, name, priority=None):
+        if not self.enabled:
+            return None
+        entry = self.sounds.get(name)
+        if entry is None:
+            return None
+        sound, default_priority, max_voices = entry
+        if priority is None:
+            priority = default_priority
+
+        i = self._pick(name, priority, max_voices)
+        if i < 0:
+            self.dropped += 1
+            return None
+        channel = self.channels[i]
+        if channel.get_busy():
+            self.stolen += 1
+        channel.play(sound)
+        self.voice_sound[i] = name
+        self.voice_priority[i] = priority
+        self.voice_start[i] = time.perf_counter()
+        return channel
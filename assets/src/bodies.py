@@ -0,0 +1,159 @@
+import numpy as np
+import pygame
+from assets.src.config import TICK_MS
+from assets.src.classes import DUMMY
+
+
+class PooledDummy:
+    """
+    Handle for one body in a DummyPool, so it can sit in the collision
+    world and take hits like a DUMMY (rect + launch()).
+    """
+    __slots__ = ("pool", "index", "rect")
+
+    def __init__(self, pool, index, rect):
+        self.pool = pool
+        self.index = index
+        self.rect = rect
+
+    def launch(self, direction):
+        self.pool.launch(self.index, direction)
+
+
+class DummyPool:
+    """
+    N dummies stepped together: positions, velocities and timers live in
+    NumPy arrays and gravity / ground / friction / wall bounce run over
+    the whole pool at once. Same rules (and same numbers) as DUMMY.update;
+    the launch comes from DUMMY.LAUNCH_* (what sweep.py tunes).
+    """
+    W = 60
+    H = 110
+    GRAVITY = 1.2
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+
+        self.x = np.zeros(capacity, dtype=np.int64)    # rect.x / rect.y
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.old_x = np.zeros(capacity, dtype=np.int64)
+        self.old_y = np.zeros(capacity, dtype=np.int64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.stun_ms = np.zeros(capacity, dtype=np.float64)
+        self.hit_flash_ms = np.zeros(capacity, dtype=np.float64)
+        self.bounced = np.zeros(capacity, dtype=np.int8)  # wall hit last step: -1 left, 1 right, 0 none
+
+        # rects + handles are kept in sync for collision / culling
+        self.rects = []
+        self.handles = []
+
+    def spawn(self, pos):
+        # pos = midbottom, like DUMMY
+        i = self.count
+        if i >= self.capacity:
+            raise IndexError("DummyPool is full")
+        self.count += 1
+
+        rect = pygame.Rect(0, 0, self.W, self.H)
+        rect.midbottom = pos
+        self.x[i] = self.old_x[i] = rect.x
+        self.y[i] = self.old_y[i] = rect.y
+        self.vx[i] = self.vy[i] = 0
+        self.stun_ms[i] = self.hit_flash_ms[i] = 0
+
+        self.rects.append(rect)
+        self.handles.append(PooledDummy(self, i, rect))
+        return self.handles[i]
+
+    def launch(self, i, direction):
+        # ridiculous arcade launch (direction like DUMMY.launch)
+        self.vx[i] = direction * DUMMY.LAUNCH_VX
+        self.vy[i] = DUMMY.LAUNCH_VY
+        self.stun_ms[i] = DUMMY.LAUNCH_STUN_MS
+        self.hit_flash_ms[i] = 120
+
+    def step(self, arena_rect, ground_y, dt_ms=TICK_MS):
+        n = self.count
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        self.old_x[:n] = x
+        self.old_y[:n] = y
+        self.bounced[:n] = 0
+
+        # physics
+        vy += self.GRAVITY
+        x += np.trunc(vx).astype(np.int64)
+        y += np.trunc(vy).astype(np.int64)
+
+        # ground
+        grounded = y + self.H >= ground_y
+        y[grounded] = ground_y - self.H
+        vy[grounded] = 0
+        # friction
+        vx[grounded] = np.trunc(vx[grounded] * 0.85)
+
+        # walls (bounce)
+        self._bounce(x < arena_rect.left, arena_rect.left, -1)
+        self._bounce(x + self.W > arena_rect.right, arena_rect.right - self.W, 1)
+
+        # timers
+        stun, flash = self.stun_ms[:n], self.hit_flash_ms[:n]
+        np.maximum(stun - dt_ms, 0, out=stun)
+        np.maximum(flash - dt_ms, 0, out=flash)
+
+        self.sync_rects()
+
+    def _bounce(self, hit, edge, side):
+        if not hit.any():
+            return
+        n = self.count
+        self.x[:n][hit] = edge
+        self.vx[:n][hit] = np.trunc(-self.vx[:n][hit] * 0.75)  # bounce back
+        self.vy[:n][hit] = -10                                 # pop up (funny)
+        self.hit_flash_ms[:n][hit] = 320
+        self.bounced[:n][hit] = side
+
+    def _arrays(self):
+        return (self.x, self.y, self.old_x, self.old_y, self.vx, self.vy, self.stun_ms, self.hit_flash_ms)
+
+    def snapshot(self):
+        # (count, raw bytes of each array) - plain values, see GAME.Snapshot
+        n = self.count
+        return (n,) + tuple(a[:n].tobytes() for a in self._arrays())
+
+    def restore(self, snap):
+        n = snap[0]
+        if n != self.count:
+            raise ValueError(f"snapshot has {n} bodies, pool has {self.count}")
+        for a, raw in zip(self._arrays(), snap[1:]):
+            a[:n] = np.frombuffer(raw, dtype=a.dtype)
+        self.sync_rects()
+
+    def sync_rects(self):
+        for rect, px, py in zip(self.rects, self.x[:self.count].tolist(), self.y[:self.count].tolist()):
+            rect.x = px
+            rect.y = py
+
+    def draw(self, screen, view, alpha=1.0, offset=(0, 0)):
+        """
+        Draws every body overlapping view (world rect); culling is done on
+        the arrays. Returns the list of screen rects touched.
+        """
+        n = self.count
+        px = np.rint(self.old_x[:n] + (self.x[:n] - self.old_x[:n]) * alpha).astype(np.int64)
+        py = np.rint(self.old_y[:n] + (self.y[:n] - self.old_y[:n]) * alpha).astype(np.int64)
+        visible = ((px + self.W > view.left) & (px < view.right) &
+                   (py + self.H > view.top) & (py < view.bottom))
+        idx = np.flatnonzero(visible)
+
+        ox, oy = offset
+        fill = screen.fill
+        flashing = (self.hit_flash_ms[idx] > 0).tolist()
+        dirty = []
+        for sx, sy, flash in zip((px[idx] + ox).tolist(), (py[idx] + oy).tolist(), flashing):
+            # flash white briefly on impact
+            color = (255, 255, 255) if flash else (200, 60, 60)
+            dirty.append(fill(color, (sx, sy, self.W, self.H)))
+        return dirty
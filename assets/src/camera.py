@@ -0,0 +1,37 @@
+import pygame
+
+
+class Camera:
+    """
+    Viewport into a stage that can be wider than the window.
+    Everything lives in world coords; offset() turns them into screen coords.
+    Follows a target with a deadzone so small steps don't scroll the
+    screen (every scroll is a full repaint for the dirty-rect renderer).
+    """
+    def __init__(self, view_size, world_rect, deadzone=0.3):
+        self.view = pygame.Rect((0, 0), view_size)   # world-space area on screen
+        self.world = world_rect
+        self.deadzone = int(view_size[0] * deadzone / 2)
+
+    def follow(self, x):
+        # keep world x inside the middle band of the screen
+        left = self.view.centerx - self.deadzone
+        right = self.view.centerx + self.deadzone
+        if x < left:
+            self.view.x -= left - x
+        elif x > right:
+            self.view.x += x - right
+        self.view.clamp_ip(self.world)
+
+    def center_on(self, x):
+        self.view.centerx = x
+        self.view.clamp_ip(self.world)
+
+    def offset(self):
+        return -self.view.x, -self.view.y
+
+    def visible(self, rect, old_rect=None):
+        # old_rect: previous-tick rect, since we draw somewhere in between
+        if self.view.colliderect(rect):
+            return True
+        return old_rect is not None and self.view.colliderect(old_rect)
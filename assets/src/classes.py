@@ -1,14 +1,27 @@
 import pygame
+from assets.src.config import TICK_MS, TICK_DT
+from assets.src.entities import interp_pos
+from assets.src.controls import Keyboard
+from assets.src.states import AnimState, load_character
 
 
 
 
 class DUMMY:
+    # no per-instance __dict__, there can be a lot of these
+    __slots__ = ("w", "h", "rect", "old_rect", "vx", "vy", "gravity", "stun_ms", "hit_flash_ms")
+
+    # launch (px per tick away from the attacker, up); tuned with assets/tools/sweep.py
+    LAUNCH_VX = 18
+    LAUNCH_VY = -14
+    LAUNCH_STUN_MS = 400
+
     def __init__(self, pos):
         self.w = 60
         self.h = 110
         self.rect = pygame.Rect(0, 0, self.w, self.h)
         self.rect.midbottom = pos
+        self.old_rect = self.rect.copy()  # position at the previous sim tick
 
         self.vx = 0
         self.vy = 0
@@ -17,15 +30,27 @@ class DUMMY:
         self.stun_ms = 0
         self.hit_flash_ms = 0
 
-    def launch(self, facing_right: bool):
-        # ridiculous arcade launch
-        self.vx = -18 if facing_right else 18
-        self.vy = -14
-        self.stun_ms = 400
+    def launch(self, direction):
+        # ridiculous arcade launch; direction = which way the hit goes (1 = right, -1 = left)
+        self.vx = direction * self.LAUNCH_VX
+        self.vy = self.LAUNCH_VY
+        self.stun_ms = self.LAUNCH_STUN_MS
         self.hit_flash_ms = 120
 
-    def update(self, arena_rect, ground_y):
-        now = pygame.time.get_ticks()
+    def snapshot(self):
+        # plain values only (see GAME.Snapshot)
+        return (self.rect.x, self.rect.y, self.old_rect.x, self.old_rect.y,
+                self.vx, self.vy, self.stun_ms, self.hit_flash_ms)
+
+    def restore(self, snap):
+        (self.rect.x, self.rect.y, self.old_rect.x, self.old_rect.y,
+         self.vx, self.vy, self.stun_ms, self.hit_flash_ms) = snap
+
+    def update(self, arena_rect, ground_y, dt_ms=TICK_MS):
+        # one fixed sim tick; velocities are px per tick
+        # returns the wall it bounced off this tick: -1 left, 1 right, 0 none
+        bounced = 0
+        self.old_rect.topleft = self.rect.topleft
 
         if self.stun_ms > 0:
             # still move, but "stunned"
@@ -52,29 +77,34 @@ class DUMMY:
             self.vx = int(-self.vx * 0.75)  # bounce back
             self.vy = -10                   # pop up (funny)
             self.hit_flash_ms = 320
+            bounced = -1
 
         if self.rect.right > arena_rect.right:
             self.rect.right = arena_rect.right
             self.vx = int(-self.vx * 0.75)
             self.vy = -10
             self.hit_flash_ms = 320
+            bounced = 1
 
 
         # timers
         if self.stun_ms > 0:
-            self.stun_ms -= 16  # approx per frame; good enough for now
+            self.stun_ms -= dt_ms
             if self.stun_ms < 0:
                 self.stun_ms = 0
 
         if self.hit_flash_ms > 0:
-            self.hit_flash_ms -= 16
+            self.hit_flash_ms -= dt_ms
             if self.hit_flash_ms < 0:
                 self.hit_flash_ms = 0
+        return bounced
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, offset=(0, 0)):
         # flash white briefly on impact
         color = (255, 255, 255) if self.hit_flash_ms > 0 else (200, 60, 60)
-        pygame.draw.rect(screen, color, self.rect)
+        x, y = interp_pos(self.old_rect, self.rect, alpha)
+        # returns the area touched (for the dirty-rect renderer)
+        return pygame.draw.rect(screen, color, (x + offset[0], y + offset[1], self.w, self.h))
 
 
 
@@ -82,196 +112,124 @@ class DUMMY:
 
 
 
-class PLAYER(pygame.sprite.Sprite):
-    def __init__(self,pos):
+class PLAYER:
+    # plain class + __slots__ (was a pygame Sprite that never joined a Group)
+    __slots__ = ("controls", "flip", "walking", "enemy_hit_registered", "anim",
+                 "image", "rect", "old_rect", "step_count",
+                 "dx", "dy", "belly_hitbox", "belly_active")
+
+    # state names in the data file
+    IDLE = "idle"
+    WALK = "walk"
+    PRE_BUMP = "pre_bump"
+    BUMP = "bump"
+
+    def __init__(self,pos,controls=None,character='assets/data/player.json'):
+        # controls: an input source from controls.py, keyboard by default
+        self.controls = controls or Keyboard()
         self.flip = False
         self.walking = False
         self.enemy_hit_registered = False
 
-        self.animation_list = []
-        self.frame_index = 0
-        self.action = 0
-        self.update_time = pygame.time.get_ticks()
-        scale = 1
-
-        temp_list = []
-        # Idle Update Action #0
-        for i in range (1):
-            img = pygame.image.load(f'assets/sprites/bigboy/Idle.png').convert_alpha()
-            img = pygame.transform.scale(img,(int(img.get_width() * scale),int(img.get_height()*scale)))
-            temp_list.append(img)
-        self.animation_list.append(temp_list)
-
-        temp_list = []
-        # Walk Update Action #1
-        for i in range (2):
-            img = pygame.image.load(f'assets/sprites/bigboy/walk/{i}.png').convert_alpha()
-            img = pygame.transform.scale(img,(int(img.get_width() * scale),int(img.get_height()*scale)))
-            temp_list.append(img)
-        self.animation_list.append(temp_list)
-
-        temp_list = []
-        # PreBump Update Action #2
-        for i in range (1):
-            img = pygame.image.load(f'assets/sprites/bigboy/PreBellyBump.png').convert_alpha()
-            img = pygame.transform.scale(img,(int(img.get_width() * scale),int(img.get_height()*scale)))
-            temp_list.append(img)
-        self.animation_list.append(temp_list)
-
-        temp_list = []
-        # The REASON we're all here Update Action #3
-        for i in range (1):
-            img = pygame.image.load(f'assets/sprites/bigboy/BellyBumpV3.png').convert_alpha()
-            img = pygame.transform.scale(img,(int(img.get_width() * scale),int(img.get_height()*scale)))
-            temp_list.append(img)
-        self.animation_list.append(temp_list)
-
-        self.image = self.animation_list[self.action][self.frame_index]
+        # states, frames, timings and the belly hitbox come from the data file
+        # (see states.py). Frames are shared through the sprite cache, so a
+        # second PLAYER costs no disk I/O.
+        self.anim = AnimState(load_character(character))
+
+        self.image = self.anim.image()
         self.rect = self.image.get_rect(topleft=(pos))
         self.old_rect = self.rect.copy()
         # --- two-step gate ---
         self.step_count = 0
-        self.last_walk_frame = 0
 
-        # --- belly bump sequencing ---
-        self.bumping = False
-        self.bump_phase = None
-        self.pre_time = 180      # ms: how long to show PreBellyBump
-        self.bump_time = 120     # ms: how long to show BellyBumpV3
-        self.bump_start = 0
+        self.dx = 0
+        self.dy = 0
+
+        # belly hitbox: one Rect, updated in place once per tick
+        self.belly_hitbox = pygame.Rect(0, 0, 0, 0)
+        self.belly_active = False
+
+    def snapshot(self):
+        return (self.flip, self.walking, self.enemy_hit_registered, self.step_count,
+                self.dx, self.dy, self.rect.x, self.rect.y, self.old_rect.x, self.old_rect.y,
+                self.belly_active, tuple(self.belly_hitbox), self.anim.snapshot())
 
-        # --- input edge detection (so holding SPACE doesn't spam) ---
-        self.space_was_down = False
+    def restore(self, snap):
+        (self.flip, self.walking, self.enemy_hit_registered, self.step_count,
+         self.dx, self.dy, self.rect.x, self.rect.y, self.old_rect.x, self.old_rect.y,
+         self.belly_active, hitbox, anim) = snap
+        self.belly_hitbox.update(hitbox)
+        self.anim.restore(anim)
+        self.image = self.anim.image()
 
     def update_animation(self):
-        ANIMATION_COOLDOWN = 150
-
-        # keep image synced to frame
-        self.image = self.animation_list[self.action][self.frame_index]
-
-        # advance frame timer
-        if pygame.time.get_ticks() - self.update_time > ANIMATION_COOLDOWN:
-            self.update_time = pygame.time.get_ticks()
-            self.frame_index += 1
-
-            # --- step counting (only while walking action #1) ---
-            if self.action == 1:
-                # count every frame change as a "step event"
-                if self.frame_index != self.last_walk_frame:
-                    self.step_count += 1
-                    self.last_walk_frame = self.frame_index
-
-        # loop animation frames
-        if self.frame_index >= len(self.animation_list[self.action]):
-            self.frame_index = 0
-
-        # --- drive belly bump phases (time-based, no extra frames needed) ---
-        if self.bumping:
-            now = pygame.time.get_ticks()
-            elapsed = now - self.bump_start
-
-            if self.bump_phase == "pre" and elapsed >= self.pre_time:
-                self.bump_phase = "hit"
-                self.bump_start = now
-                self.update_action(3)  # BellyBumpV3
-
-            elif self.bump_phase == "hit" and elapsed >= self.bump_time:
-                # end attack
-                self.bumping = False
-                self.bump_phase = None
-                self.step_count = 0
-                self.update_action(0)  # back to idle
-
-    def update_action(self,new_action):
-        #check if action is different from previous
-        if new_action != self.action:
-            self.action = new_action
-        #update animation settings
-            self.frame_index = 0
-            self.update_time = pygame.time.get_ticks()
-    def action_handler(self):
-        if self.bumping:
-            return
+        anim = self.anim
+        # advance one tick on the precomputed timeline (bump phases chain
+        # pre_bump -> bump -> idle through the data's "next")
+        anim.step()
+
+        # --- step counting: every walk frame change is a "step event" ---
+        if anim.frame_changed and anim.state.name == self.WALK:
+            self.step_count += 1
+
+        self.image = anim.image()
 
-        if self.walking:
-            self.update_action(1)
-        else:
-            self.update_action(0)
     def input(self):
         self.walking = False
         self.dx = 0
         self.dy = 0
-        key = pygame.key.get_pressed()
-        if self.bumping:
-            self.walking = False
-            self.dx = 0
-            self.dy = 0
+        anim = self.anim
+        if not anim.can_enter(self.WALK):
+            # mid belly bump: no control
             return
+        controls = self.controls
+        key = controls.get_pressed()
         if key[pygame.K_LEFT] or key[pygame.K_a]:
             self.walking = True
-            #self.update_action(1)
-            self.dx -= 5
             self.flip = False
         elif key[pygame.K_RIGHT] or key[pygame.K_d]:
             self.walking = True
-            #self.update_action(1)
-            self.dx += 5
             self.flip = True
-        else:
-            self.walking = False
-        # SPACE edge-detect (pressed this frame)
-        space_down = key[pygame.K_SPACE]
-        space_pressed = space_down and not self.space_was_down
-        self.space_was_down = space_down
-
-        if (not self.bumping) and space_pressed and self.step_count >= 2:
-            # start pre-bump -> smash
+        # SPACE: a press from the last few ticks counts (input buffer),
+        # holding it doesn't spam since each press is consumed once
+        if self.step_count >= 2 and controls.buffered(pygame.K_SPACE) and anim.can_enter(self.PRE_BUMP):
+            # start pre-bump -> smash (uses up the steps)
+            controls.consume(pygame.K_SPACE)
             self.enemy_hit_registered = False
-
-            self.bumping = True
-            self.bump_phase = "pre"
-            self.bump_start = pygame.time.get_ticks()
-            self.update_action(2)  # PreBellyBump
+            self.step_count = 0
+            anim.set(self.PRE_BUMP)
             self.walking = False
-            self.dx = 0
-            self.dy = 0
-        if self.bumping and self.bump_phase == "hit":
-            self.dx = -6 if self.flip else 6
+            return
 
-        self.action_handler()
+        anim.set(self.WALK if self.walking else self.IDLE)
+        if self.walking:
+            speed = anim.state.speed
+            self.dx = speed if self.flip else -speed
         self.rect.x += self.dx
         self.rect.y += self.dy
 
         # If you stopped walking, reset the step gate
-        if not self.walking and not self.bumping:
+        if not self.walking:
             self.step_count = 0
-            self.last_walk_frame = self.frame_index
             self.enemy_hit_registered = False
 
-    def get_belly_hitbox(self):
-        # Only active during hit phase
-        if not self.bumping or self.bump_phase != "hit":
-            return None
-
-        # Make a big rectangle in front of the player
-        w = int(self.rect.width * 0.25)
-        h = int(self.rect.height * 0.45)
-        y = self.rect.centery - h // 2
+    def _update_belly_hitbox(self):
+        # Only frames with hitbox data (the bump) have one: a big rectangle in front of the player
+        facing_right = (self.flip == True)  # flip True = facing right (the frames face left)
+        self.belly_active = self.anim.hitbox(self.rect, facing_right, self.belly_hitbox)
 
-        facing_right = (self.flip == True)  # in your system: flip False = facing right
-
-        if facing_right:
-            x = self.rect.centerx + int(self.rect.width * 0.10)
-        else:
-            x = self.rect.centerx - int(self.rect.width * 0.10) - w
-
-        return pygame.Rect(x, y, w, h)
+    def get_belly_hitbox(self):
+        # computed once per tick in update(); same Rect every time, don't keep it
+        return self.belly_hitbox if self.belly_active else None
 
-    def update(self):
+    def update(self, dt=TICK_DT):
+        # one fixed sim tick: dx/dy are px per tick, animation/bump timing is in ticks
+        self.old_rect.topleft = self.rect.topleft
         self.input()
-    def draw(self,screen):
         self.update_animation()
-        if self.flip:
-            screen.blit(pygame.transform.flip(self.image,self.flip,False),self.rect)
-        else:
-            screen.blit(self.image,self.rect)
+        self._update_belly_hitbox()
+    def draw(self,screen,alpha=1.0,offset=(0, 0)):
+        x, y = interp_pos(self.old_rect, self.rect, alpha)
+        pos = (x + offset[0], y + offset[1])
+        # returns the area touched (for the dirty-rect renderer)
+        return screen.blit(self.anim.image(self.flip),pos)
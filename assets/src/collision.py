@@ -0,0 +1,143 @@
+import pygame
+
+_solid = {}  # (w, h) -> all-set Mask, for the pixel test
+
+
+def pixels_touch(hitbox, hurtbox, hit_mask, hit_rect, hurt_mask, hurt_rect):
+    """
+    Pixel test inside the overlap of two boxes that already collide.
+    hit_mask / hurt_mask are sprite masks placed at hit_rect / hurt_rect's
+    top-left; None = that box is solid.
+    """
+    region = hitbox.clip(hurtbox)
+    size = region.size
+    area = _solid.get(size)
+    if area is None:
+        area = _solid[size] = pygame.Mask(size, fill=True)
+    if hit_mask is not None:
+        area = area.overlap_mask(hit_mask, (hit_rect.x - region.x, hit_rect.y - region.y))
+    if hurt_mask is not None:
+        return area.overlap(hurt_mask, (hurt_rect.x - region.x, hurt_rect.y - region.y)) is not None
+    return area.count() > 0
+
+
+class HitEvent:
+    """
+    attacker's hitbox overlapped victim's hurtbox this tick.
+    direction: +1 / -1, which way the attacker was hitting (1 = to the right).
+    """
+    __slots__ = ("attacker", "victim", "direction", "hitbox", "hurtbox")
+
+    def __init__(self, attacker, victim, direction, hitbox, hurtbox):
+        self.attacker = attacker
+        self.victim = victim
+        self.direction = direction
+        self.hitbox = hitbox
+        self.hurtbox = hurtbox
+
+
+class CollisionWorld:
+    """
+    Per-tick hitbox/hurtbox registry.
+      - clear() at the start of the tick
+      - everyone registers their boxes (world coords)
+      - resolve() -> list of HitEvents
+    Broad phase is a uniform-grid spatial hash of the hurtboxes, so each
+    hitbox only does rect tests against hurtboxes sharing a cell with it
+    (instead of every fighter vs every dummy). The grid is only built on
+    ticks that actually have a hitbox out.
+    Boxes can carry a sprite mask (+ the rect the sprite is drawn at); then
+    overlapping boxes only count if the pixels touch too (pixels_touch), so
+    the transparent corners of a frame don't hit.
+    """
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        # parallel lists (no per-box tuple allocated every tick)
+        self.hit_owners = []
+        self.hit_rects = []
+        self.hit_dirs = []
+        self.hit_masks = []
+        self.hit_mask_rects = []
+        self.hurt_owners = []
+        self.hurt_rects = []
+        self.hurt_masks = {}   # index -> (mask, rect), only the boxes that have one
+        self.cells = {}      # (cx, cy) -> [hurtbox index, ...]
+        self.no_events = []  # shared result for the (usual) no-hitbox tick, don't mutate
+
+    def clear(self):
+        self.hit_owners.clear()
+        self.hit_rects.clear()
+        self.hit_dirs.clear()
+        self.hit_masks.clear()
+        self.hit_mask_rects.clear()
+        self.hurt_owners.clear()
+        self.hurt_rects.clear()
+        self.hurt_masks.clear()
+        self.cells.clear()
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (range(rect.left // cs, (rect.right - 1) // cs + 1),
+                range(rect.top // cs, (rect.bottom - 1) // cs + 1))
+
+    def add_hurtbox(self, owner, rect, mask=None, mask_rect=None):
+        self.hurt_owners.append(owner)
+        self.hurt_rects.append(rect)
+        if mask is not None:
+            # the --stress crowd adds thousands of maskless boxes: keep that path two appends
+            self.hurt_masks[len(self.hurt_rects) - 1] = (mask, mask_rect)
+
+    def _build_grid(self):
+        cells = self.cells
+        cs = self.cell_size
+        for index, rect in enumerate(self.hurt_rects):
+            for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+                for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [index]
+                    else:
+                        bucket.append(index)
+
+    def add_hitbox(self, owner, rect, direction, mask=None, mask_rect=None):
+        self.hit_owners.append(owner)
+        self.hit_rects.append(rect)
+        self.hit_dirs.append(direction)
+        self.hit_masks.append(mask)
+        self.hit_mask_rects.append(mask_rect)
+
+    def candidates(self, rect):
+        # hurtbox indices sharing a cell with rect (sorted, so results are deterministic)
+        found = set()
+        xs, ys = self._cell_range(rect)
+        cells = self.cells
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def resolve(self):
+        if not self.hit_rects:
+            return self.no_events
+        self._build_grid()
+
+        events = []
+        hurt_owners, hurt_rects = self.hurt_owners, self.hurt_rects
+        hurt_masks = self.hurt_masks
+        for attacker, hitbox, direction, hit_mask, hit_mask_rect in zip(
+                self.hit_owners, self.hit_rects, self.hit_dirs, self.hit_masks, self.hit_mask_rects):
+            for index in self.candidates(hitbox):
+                victim, hurtbox = hurt_owners[index], hurt_rects[index]
+                if victim is attacker:
+                    continue
+                # narrow phase: boxes first, pixels only for boxes that overlap
+                if not hitbox.colliderect(hurtbox):
+                    continue
+                hurt_mask, hurt_mask_rect = hurt_masks.get(index, (None, None))
+                if (hit_mask is not None or hurt_mask is not None) and not pixels_touch(
+                        hitbox, hurtbox, hit_mask, hit_mask_rect, hurt_mask, hurt_mask_rect):
+                    continue
+                events.append(HitEvent(attacker, victim, direction, hitbox, hurtbox))
+        return events
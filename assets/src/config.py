@@ -2,3 +2,45 @@ FPS = 60
 BG = (100,80,100)
 width,height = 800,600
 RES = (width,height)
+
+# window: the game is always drawn at RES and scaled onto the window in one
+# pass (see render.Display). None = window is RES, no scaling at all.
+WINDOW_SIZE = None
+SCALE_FILTER = "integer"   # "integer" = sharp whole-number zoom (smooth when that'd be 1x), "smooth" = fill the window
+FULLSCREEN = False
+
+# stage can be wider than the window (camera scrolls, see camera.py)
+STAGE_WIDTH = width
+
+# fixed-timestep simulation (render rate is FPS, sim rate is TICK_RATE)
+TICK_RATE = 60
+TICK_MS = 1000 / TICK_RATE
+TICK_DT = 1 / TICK_RATE
+MAX_STEPS = 5        # most sim ticks run per rendered frame, extra backlog is dropped
+
+# mixer: small buffer = low latency (raise it if the audio crackles)
+AUDIO_FREQ = 44100
+AUDIO_BUFFER = 128
+AUDIO_VOICES = 16   # SFX channels, see audio.py
+
+# replays: a full state snapshot this often (seek granularity), saved here
+REPLAY_SNAPSHOT_TICKS = 600
+REPLAY_DIR = "replays"
+
+# netplay: how far (ticks) we run ahead of the other cabinet's input before waiting
+NETPLAY_MAX_ROLLBACK = 8
+NETPLAY_PORT = 7777
+
+# hits need the attacker's opaque pixels (inside its hitbox) to touch the
+# victim, not just the boxes (see collision.py). Off by default: BigBoy's
+# bump box mostly sticks out past his sprite, retune it (sweep hit_x) first
+PIXEL_HITS = False
+
+# dust / sweat particles alive at once (oldest get reused past this)
+PARTICLE_CAPACITY = 4096
+
+# F3 profiles this many frames (see profiling.py)
+PROFILE_FRAMES = 120
+
+# a press this many ticks before it can act still counts (~100 ms)
+INPUT_BUFFER_TICKS = 6
@@ -0,0 +1,313 @@
+import time
+import bisect
+import pygame
+from assets.src.config import INPUT_BUFFER_TICKS
+
+# Input sources for PLAYER.input() / BigBoy.update().
+# Key events go into a ring buffer with the time we got them and are handed
+# to the sim tick by tick, so a tap shorter than a frame is never lost:
+#   get_pressed()[key]  held this tick (a tap that already ended still counts once)
+#   pressed(key)        went down since the last tick
+#   released(key)       went up since the last tick
+#   buffered(key)       went down within the last INPUT_BUFFER_TICKS and nobody
+#                       consume()d it yet (press a bit early, still fires)
+# GAME calls advance() once per sim tick and presented() once per shown frame;
+# presented() hands back (ms, frames) from each consumed press to that frame,
+# which GAME puts in FrameStats (F1 overlay / F2 export).
+# Events are reported to `recorder` (replay.py) at the tick the sim sees them,
+# which is all a replay needs to reproduce the match.
+
+# the only keys the sim reads (PLAYER.input / BigBoy.update); replays and
+# netplay only carry these, bit i of a key mask = SIM_KEYS[i]
+SIM_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+            pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s, pygame.K_SPACE)
+
+
+def key_mask(source):
+    # this tick's input from an EventInput as a SIM_KEYS mask (a tap that already ended counts as held)
+    keys = source.get_pressed()
+    mask = 0
+    for i, key in enumerate(SIM_KEYS):
+        if keys[key]:
+            mask |= 1 << i
+    return mask
+
+
+class EventInput:
+    """
+    KEYDOWN/KEYUP ring buffer + per-tick pressed/held/released + input buffer.
+    Also measures input-to-present latency for presses the sim consumed.
+    """
+    def __init__(self, size=64, buffer_ticks=INPUT_BUFFER_TICKS):
+        self.size = size
+        self.buffer_ticks = buffer_ticks
+
+        # ring buffer of raw events (head = next write, tail = next to hand to the sim)
+        self.ev_key = [0] * size
+        self.ev_down = [False] * size
+        self.ev_time = [0.0] * size     # ms (perf_counter) when we got it
+        self.ev_frame = [0] * size      # frames presented before it arrived
+        self.head = 0
+        self.tail = 0
+
+        self.tick = 0
+        self.held = set()
+        self.tick_pressed = set()
+        self.tick_released = set()
+        self.press_tick = {}    # key -> tick its last unconsumed press reached the sim
+        self.press_time = {}    # key -> (ms, frame) of that press
+
+        # latency: consumed presses waiting for the next present. Only once
+        # something presents (not headless / sweeps / re-simulated ticks),
+        # and never more than `size` of them
+        self.frame = 0
+        self.presenting = False
+        self.timing = True    # False while rollback re-runs ticks (those presses were timed already)
+        self.waiting = []
+
+        self.recorder = None
+
+    # --- feeding ---
+    def push(self, key, down, now_ms=None):
+        i = self.head % self.size
+        self.ev_key[i] = key
+        self.ev_down[i] = down
+        self.ev_time[i] = time.perf_counter() * 1000 if now_ms is None else now_ms
+        self.ev_frame[i] = self.frame
+        self.head += 1
+        if self.head - self.tail > self.size:
+            self.tail = self.head - self.size  # overflow: drop the oldest
+
+    def handle(self, event):
+        # pygame doesn't expose SDL's event timestamp, so "now" (poll time) it is
+        if event.type == pygame.KEYDOWN:
+            self.push(event.key, True)
+        elif event.type == pygame.KEYUP:
+            self.push(event.key, False)
+
+    def _sync(self):
+        # hand every buffered event to the current tick
+        while self.tail < self.head:
+            i = self.tail % self.size
+            key = self.ev_key[i]
+            if self.recorder is not None:
+                self.recorder.event(self.tick, key, self.ev_down[i])
+            if self.ev_down[i]:
+                self.held.add(key)
+                self.tick_pressed.add(key)
+                self.press_tick[key] = self.tick
+                self.press_time[key] = (self.ev_time[i], self.ev_frame[i])
+            else:
+                self.held.discard(key)
+                self.tick_released.add(key)
+            self.tail += 1
+
+    # --- queries (sim side) ---
+    def get_pressed(self):
+        if self.tail != self.head:
+            self._sync()
+        return self
+
+    def __getitem__(self, key):
+        return key in self.held or key in self.tick_pressed
+
+    def pressed(self, key):
+        if self.tail != self.head:
+            self._sync()
+        return key in self.tick_pressed
+
+    def released(self, key):
+        if self.tail != self.head:
+            self._sync()
+        return key in self.tick_released
+
+    def buffered(self, key):
+        if self.tail != self.head:
+            self._sync()
+        t = self.press_tick.get(key)
+        return t is not None and self.tick - t <= self.buffer_ticks
+
+    def consume(self, key):
+        # the sim acted on this press: don't let it fire twice, time it to the screen
+        self.press_tick.pop(key, None)
+        stamp = self.press_time.pop(key, None)
+        if stamp is not None and self.timing and self.presenting and len(self.waiting) < self.size:
+            self.waiting.append(stamp)
+
+    # --- save/restore (replays) ---
+    def snapshot(self):
+        # what the sim can see; events not handed to a tick yet aren't part of it
+        # (sorted, so two sims in the same state give equal snapshots)
+        return (self.tick, tuple(sorted(self.held)), tuple(sorted(self.tick_pressed)),
+                tuple(sorted(self.tick_released)), tuple(sorted(self.press_tick.items())))
+
+    def restore(self, snap):
+        tick, held, pressed, released, press_tick = snap
+        self.tick = tick
+        self.held = set(held)
+        self.tick_pressed = set(pressed)
+        self.tick_released = set(released)
+        self.press_tick = dict(press_tick)
+        self.press_time.clear()
+        self.waiting.clear()
+        self.tail = self.head  # drop whatever was still pending
+
+    # --- clock ---
+    def advance(self):
+        self.tick += 1
+        if self.tick_pressed:
+            self.tick_pressed.clear()
+        if self.tick_released:
+            self.tick_released.clear()
+
+    def presented(self):
+        # call right after the frame went to the display; returns
+        # [(ms, frames), ...] for the presses this frame was the first to show
+        # (frames: 1 = the first frame presented after the press arrived showed it)
+        self.frame += 1
+        self.presenting = True
+        if not self.waiting:
+            return ()
+        now = time.perf_counter() * 1000
+        samples = [(now - ms, self.frame - frame) for ms, frame in self.waiting]
+        self.waiting.clear()
+        return samples
+
+
+class Keyboard(EventInput):
+    """
+    The real keyboard, fed from GAME.EventHandler.
+    """
+
+
+class ScriptedInput(EventInput):
+    """
+    Plays back one set of held keys per sim tick, as key events.
+    frames: list of key sets. When it runs out, nothing is held (or it loops).
+    """
+    def __init__(self, frames, loop=False):
+        EventInput.__init__(self)
+        self.frames = [frozenset(f) for f in frames]
+        self.loop = loop
+        self.nothing = frozenset()
+        self.current = self.nothing
+        self._feed()
+
+    @classmethod
+    def from_segments(cls, segments, loop=False):
+        # [(ticks, {keys}), ...] -> hold each key set for that many ticks
+        frames = []
+        for ticks, keys in segments:
+            frames.extend([keys] * ticks)
+        return cls(frames, loop)
+
+    def handle(self, event):
+        pass  # the script is the only input
+
+    def frame_keys(self, tick):
+        if tick < len(self.frames):
+            return self.frames[tick]
+        if self.loop and self.frames:
+            return self.frames[tick % len(self.frames)]
+        return self.nothing
+
+    def _feed(self):
+        # turn the difference to the next scripted frame into key events
+        keys = self.frame_keys(self.tick)
+        if keys == self.current:
+            return
+        for key in self.current - keys:
+            self.push(key, False)
+        for key in keys - self.current:
+            self.push(key, True)
+        self.current = keys
+
+    def restore(self, snap):
+        EventInput.restore(self, snap)
+        self.current = frozenset(self.held)
+        self._feed()
+
+    def advance(self):
+        EventInput.advance(self)
+        self._feed()
+
+
+class TickInput(EventInput):
+    """
+    Input handed over one tick at a time as a SIM_KEYS mask (netplay: both
+    cabinets feed the same masks, so both sims see the same key events).
+    """
+    def __init__(self):
+        EventInput.__init__(self)
+        self.current = 0
+
+    def handle(self, event):
+        pass  # fed by feed() only
+
+    def feed(self, mask, press_time=None):
+        # call before the tick that should see it. Handed to the tick right
+        # away (not when the sim first asks), so nothing is ever pending
+        # between ticks and snapshot() is the whole input state.
+        # press_time: the real input source's press_time (netplay), so input
+        # latency counts from the key press rather than from here
+        changed = mask ^ self.current
+        if changed:
+            for i, key in enumerate(SIM_KEYS):
+                if changed >> i & 1:
+                    down = bool(mask >> i & 1)
+                    stamp = press_time.get(key) if down and press_time else None
+                    self.push(key, down, None if stamp is None else stamp[0])
+            self.current = mask
+            self._sync()
+
+    def restore(self, snap):
+        EventInput.restore(self, snap)
+        self.current = 0
+        for i, key in enumerate(SIM_KEYS):
+            if key in self.held:
+                self.current |= 1 << i
+
+
+class ReplayInput(EventInput):
+    """
+    Plays back recorded key events, each at the tick the sim originally got it.
+    events: [(tick, key, down), ...] sorted by tick (see replay.py).
+    """
+    def __init__(self, events):
+        EventInput.__init__(self)
+        self.events = events
+        self.ticks = [e[0] for e in events]
+        self.cursor = 0
+        self._feed()
+
+    def handle(self, event):
+        pass  # the recording is the only input
+
+    def _feed(self):
+        events, tick = self.events, self.tick
+        while self.cursor < len(events) and events[self.cursor][0] <= tick:
+            _, key, down = events[self.cursor]
+            self.push(key, down)
+            self.cursor += 1
+
+    def restore(self, snap):
+        EventInput.restore(self, snap)
+        self.cursor = bisect.bisect_left(self.ticks, self.tick)
+        self._feed()
+
+    def advance(self):
+        EventInput.advance(self)
+        self._feed()
+
+
+def soak_script():
+    # walk up, bump, back off, repeat forever (default input for headless runs)
+    right, left, space = pygame.K_RIGHT, pygame.K_LEFT, pygame.K_SPACE
+    return ScriptedInput.from_segments([
+        (40, {right}),
+        (1, {right, space}),
+        (40, set()),
+        (40, {left}),
+        (1, {left, space}),
+        (40, set()),
+    ], loop=True)
@@ -1,103 +1,381 @@
+import os
+import time
 import pygame, sys
 from assets.src.config import *
-from assets.src.entities import BigBoy
+from assets.src.entities import BigBoy, interp_pos
 from assets.src.classes import *
+from assets.src.controls import Keyboard, soak_script
+from assets.src.render import Display, Renderer
+from assets.src.camera import Camera
+from assets.src.collision import CollisionWorld
+from assets.src.bodies import DummyPool, PooledDummy
+from assets.src.particles import ParticlePool, DUST, SWEAT
+from assets.src.perf import FrameStats, PerfOverlay
+from assets.src.profiling import Capture
+from assets.src.loader import AssetLoader, LoadingScreen, StartupLog
+from assets.src.states import load_character
+from assets.src import audio
 
 class GAME:
-    def __init__(self):
+    def __init__(self, headless=False, controls=None, stress=0, p2_controls=None,
+                 window_size=WINDOW_SIZE, scale_filter=SCALE_FILTER, fullscreen=FULLSCREEN):
+        # headless: no window, no audio device, no frame cap, scripted input.
+        # For soak/regression runs on machines without a GPU or sound card.
+        # p2_controls: put BigBoy in the ring as player 2, driven by these.
+        # window_size / scale_filter / fullscreen: see render.Display (headless ignores them).
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        else:
+            audio.pre_init()   # must come before pygame.init() to take effect
+        self.startup = StartupLog()
         pygame.init()
+        self.audio = audio.AudioManager(enabled=not headless)
+        self.startup.mark("init")
 
-        pygame.mixer.pre_init(44100, -16, 2, 128)
-        pygame.mixer.init()
-
-        # music (streamed)
-        pygame.mixer.music.load("assets/audio/homedepot.mp3")
-        pygame.mixer.music.set_volume(0.45)
-        pygame.mixer.music.play(-1)   # -1 loops forever
-
-        # hit sfx (small, loaded in memory)
-        self.sfx_hit = pygame.mixer.Sound("assets/audio/hit.mp3")
-        self.sfx_hit.set_volume(0.90)
-        self.screen = pygame.display.set_mode(RES)
+        # window first, so there's something on screen while assets decode
+        # (dummy driver still gives us a surface, convert_alpha() needs one)
+        # Everything is drawn into self.screen at RES; self.display scales it
+        # onto the window once per frame.
+        if headless:
+            window_size, fullscreen = None, False
+        self.display = Display(RES, window_size, scale_filter, fullscreen)
+        self.screen = self.display.surface
         self.clock = pygame.time.Clock()
+        self.accumulator = 0.0   # ms of sim time waiting to be stepped
+        self.tick = 0            # sim ticks run so far
         self.hit_pause =0
         self.shake = 0
+        self.startup.mark("display")
+
+        # sprites + audio on a background thread, loading bar meanwhile
+        loader = AssetLoader()
+        loader.add("player", lambda: load_character("assets/data/player.json"))
+        if p2_controls is not None:
+            loader.add("bigboy", lambda: load_character("assets/data/bigboy.json", sprite_dir="assets/sprites"))
+        if self.audio.enabled:
+            # music (streamed, so this only opens the file)
+            loader.add("music", lambda: pygame.mixer.music.load("assets/audio/homedepot.mp3"))
+            # hit sfx (decoded PCM, cached as WAV after the first run)
+            loader.add("hit sfx", lambda: self.audio.load("hit", "assets/audio/hit.mp3", volume=0.90))
+        loader.start()
+        if headless:
+            loader.wait()
+        else:
+            LoadingScreen(self.screen, output=self.display).run(loader)
+        self.startup.mark("assets")
+        self.startup.jobs = loader.timings
 
+        if self.audio.enabled:
+            pygame.mixer.music.set_volume(0.45)
+            pygame.mixer.music.play(-1)   # -1 loops forever
 
         # arena bounds (simple stage walls)
         self.arena = pygame.Rect(40, 0, RES[0] - 80, RES[1])
 
-        # BigBoy sprites live here:
-        #self.bigboy = BigBoy(sprite_dir="assets/sprites", pos=(220, 420), ground_y=420)
-
-        self.player = PLAYER((220, 300))
-        self.arena = pygame.Rect(60, 0, RES[0] - 120, RES[1])
+        if controls is None:
+            controls = soak_script() if headless else Keyboard()
+        self.controls = controls
+        # whatever gets the real key events (netplay swaps in its own, see netplay.py)
+        self.keyboard = controls
+        # whose presses F1/F2 time to the screen (netplay: the local player's TickInput)
+        self.latency_input = controls
+        self.player = PLAYER((220, 300), controls)
+        self.world = pygame.Rect(0, 0, STAGE_WIDTH, RES[1])
+        self.arena = pygame.Rect(60, 0, STAGE_WIDTH - 120, RES[1])
         self.ground_y = 420
 
+        # BigBoy sprites live here:
+        self.bigboy = None
+        self.p2_controls = p2_controls
+        if p2_controls is not None:
+            self.bigboy = BigBoy(sprite_dir="assets/sprites", pos=(620, self.ground_y), ground_y=self.ground_y)
+
         self.enemy = DUMMY((520, self.ground_y))
+        self.dummies = [self.enemy]
+
+        # --stress N: extra dummies, stepped as one NumPy batch
+        self.crowd = DummyPool(stress)
+        for i in range(stress):
+            x = self.arena.left + 30 + (i * 37) % max(1, self.arena.width - 60)
+            self.crowd.spawn((x, self.ground_y))
+
+        # dust / sweat on hits and wall bounces (visual only, not in Snapshot)
+        self.particles = ParticlePool(floor=self.ground_y)
+
+        # hitboxes/hurtboxes get registered here every tick
+        self.collisions = CollisionWorld()
 
         self.debug = False
 
+        # frame timings (always collected), shown with F1, dumped with F2
+        self.stats = FrameStats(budget_ms=1000 / FPS)
+        self.overlay = PerfOverlay()
+        # F3 / --profile: cProfile the next N frames (None = not capturing)
+        self.capture = None
+        # replay.ReplayRecorder while recording (see StartRecording)
+        self.recorder = None
+        # netplay.RollbackSession when playing against another cabinet
+        self.netplay = None
+        # hotreload.HotReload in --watch mode
+        self.hotreload = None
+        self.resimulating = False   # rollback re-running ticks: no sounds
+
+        # everything is in world coords, camera maps them onto the screen
+        self.camera = Camera(RES, self.world)
+        self.camera.center_on(self.player.rect.centerx)
+
+        # static layer drawn once, sprites composited over it
+        self.renderer = Renderer(self.screen, self.BuildStage(), self.display)
+        self.startup.mark("world")
+        if headless:
+            self.startup.report()
+            self.startup = None
+
+    def BuildStage(self):
+        stage = pygame.Surface(self.world.size).convert()
+        stage.fill(BG)
+
+        # stage walls (visual)
+        pygame.draw.rect(stage, (40, 40, 40), self.arena, 3)
+        # arena walls
+        pygame.draw.rect(stage, (50, 50, 50), self.arena, 3)
+        return stage
+
     def EventHandler(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                self.SaveReplay()
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_F1:
                 self.debug = not self.debug
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                for path in self.stats.export(time.strftime("perf_%Y%m%d_%H%M%S")):
+                    print("saved", path)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.StartCapture(PROFILE_FRAMES, memory=bool(event.mod & pygame.KMOD_SHIFT))
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self.keyboard.handle(event)
 
-    def DisplayHandler(self):
-        self.screen.fill(BG)
+    def DisplayHandler(self, alpha=1.0):
+        # alpha = how far we are between the last sim tick and the next one
+        camera = self.camera
+        player_x, _ = interp_pos(self.player.old_rect, self.player.rect, alpha)
+        camera.follow(player_x + self.player.rect.width // 2)
 
-        # stage walls (visual)
-        pygame.draw.rect(self.screen, (40, 40, 40), self.arena, 3)
+        # hit-pause shake = composite offset (whole frame repaints while it changes)
+        offset_x, offset_y = camera.offset()
+        if self.hit_pause > 0:
+            offset_x += (-2 if self.hit_pause % 2 == 0 else 2)
+        offset = (offset_x, offset_y)
 
-        #self.bigboy.draw(self.screen, debug=self.debug)
+        renderer = self.renderer
+        renderer.begin(offset)
 
-        self.player.draw(self.screen)
-        # arena walls
-        pygame.draw.rect(self.screen, (50, 50, 50), self.arena, 3)
+        # off-screen stuff is culled before any blit
+        bigboy = self.bigboy
+        if bigboy is not None and camera.visible(bigboy.rect, bigboy.old_rect):
+            renderer.add(bigboy.draw(self.screen, debug=self.debug, alpha=alpha, offset=offset))
 
-        # enemy
-        self.enemy.draw(self.screen)
+        renderer.add(self.player.draw(self.screen, alpha, offset))
+
+        # enemies
+        for dummy in self.dummies:
+            if camera.visible(dummy.rect, dummy.old_rect):
+                renderer.add(dummy.draw(self.screen, alpha, offset))
+        if self.crowd.count:
+            renderer.extend(self.crowd.draw(self.screen, camera.view, alpha, offset))
+        renderer.add(self.particles.draw(self.screen, camera.view, alpha, offset))
 
         # debug draw belly hitbox
         hitbox = self.player.get_belly_hitbox()
         #if hitbox:
-            #pygame.draw.rect(self.screen, (0, 255, 0), hitbox, 2)
-        offset_x = 0
-        if self.hit_pause > 0:
-            offset_x = (-2 if self.hit_pause % 2 == 0 else 2)
+            #renderer.add(pygame.draw.rect(self.screen, (0, 255, 0), hitbox.move(offset), 2))
 
-        self.screen.blit(self.screen, (offset_x, 0))
+        if self.debug:
+            renderer.add(self.overlay.draw(self.screen, self.stats))
+        self.stats.mark("display")
 
-        pygame.display.flip()
+        renderer.present()
+        self.stats.mark("flip")
+        for ms, frames in self.latency_input.presented():
+            self.stats.input(ms, frames)
 
 
     def UpdateHandler(self):
-        #self.bigboy.update(dt, keys, opponent_hurtbox=None, arena_rect=self.arena)
+        # one fixed sim tick (TICK_MS)
+        if self.bigboy is not None:
+            self.bigboy.update(TICK_DT, self.p2_controls, opponent_hurtbox=self.enemy.rect, arena_rect=self.arena)
         self.player.update()
+        # rollback re-runs ticks that already made their particles
+        effects = not self.resimulating
+        if effects:
+            self.particles.step()
                 # update enemy physics
-        self.enemy.update(self.arena, self.ground_y)
+        for dummy in self.dummies:
+            side = dummy.update(self.arena, self.ground_y)
+            if side and effects:
+                self.WallBurst(dummy.rect, side)
+        if self.crowd.count:
+            self.crowd.step(self.arena, self.ground_y)
+            bounced = self.crowd.bounced[:self.crowd.count]
+            if effects and bounced.any():
+                rects = self.crowd.rects
+                for i in bounced.nonzero()[0].tolist():
+                    self.WallBurst(rects[i], int(bounced[i]))
+
+        # --- collisions: register boxes, then handle hit events ---
+        world = self.collisions
+        world.clear()
+        # fighters hit / get hit with their sprite's pixels (PIXEL_HITS), dummies are solid boxes
+        pixels = PIXEL_HITS
+        player_mask = self.player.anim.mask(self.player.flip) if pixels else None
+        world.add_hurtbox(self.player, self.player.rect, player_mask, self.player.rect)
+        for dummy in self.dummies:
+            world.add_hurtbox(dummy, dummy.rect)
+        for dummy in self.crowd.handles:
+            world.add_hurtbox(dummy, dummy.rect)
+
         hitbox = self.player.get_belly_hitbox()
-        if hitbox and not self.player.enemy_hit_registered and hitbox.colliderect(self.enemy.rect):
-            facing_right = (self.player.flip == False)
-            self.enemy.launch(facing_right)
-            self.player.enemy_hit_registered = True
-            self.sfx_hit.play()
-            self.hit_pause = 20  # frames of freeze
+        if hitbox and not self.player.enemy_hit_registered:
+            # flip True = facing right (see PLAYER._update_belly_hitbox)
+            world.add_hitbox(self.player, hitbox, 1 if self.player.flip else -1, player_mask, self.player.rect)
+        if self.bigboy is not None:
+            bigboy = self.bigboy
+            bigboy_mask = bigboy.anim.mask(mirrored=bigboy.facing == -1) if pixels else None
+            world.add_hurtbox(bigboy, bigboy.hurtbox, bigboy_mask, bigboy.rect)
+            if bigboy.belly_active:
+                world.add_hitbox(bigboy, bigboy.belly_hitbox, bigboy.facing, bigboy_mask, bigboy.rect)
+
+        for hit in world.resolve():
+            if not isinstance(hit.victim, (DUMMY, PooledDummy)):
+                continue  # only dummies react to hits for now
+            if hit.attacker is self.player:
+                # one launch per bump
+                if self.player.enemy_hit_registered:
+                    continue
+                self.player.enemy_hit_registered = True
+            hit.victim.launch(hit.direction)
+            # the main fight outranks the --stress crowd for channels
+            if effects:
+                self.audio.play("hit", 2 if hit.victim is self.enemy else 1)
+                self.HitBurst(hit)
+            self.hit_pause = 20  # ticks of freeze
+
+    def HitBurst(self, hit):
+        # sweat off the contact point, dust kicked up under the victim; both fly
+        # the way the victim was launched (hit.direction, 1 = right)
+        self.particles.burst(SWEAT, hit.hitbox.clip(hit.hurtbox).center, hit.direction, 10)
+        self.particles.burst(DUST, hit.victim.rect.midbottom, hit.direction, 8)
+
+    def WallBurst(self, rect, side):
+        # side: the wall it hit (-1 left, 1 right); everything flies back off it
+        x = rect.left if side < 0 else rect.right
+        self.particles.burst(DUST, (x, rect.centery), -side, 10)
+        self.particles.burst(SWEAT, (x, rect.top + rect.height // 4), -side, 6)
+
+    def Step(self):
+        self.tick += 1
+        if self.hit_pause > 0:
+            # world frozen, screen shakes
+            self.hit_pause -= 1
+        else:
+            self.UpdateHandler()
+        self.controls.advance()
+        if self.p2_controls is not None:
+            self.p2_controls.advance()
+        if self.recorder is not None and self.tick % self.recorder.snapshot_ticks == 0:
+            self.recorder.snapshot(self.tick, self.Snapshot())
+
+    def Snapshot(self):
+        # whole sim state as nested tuples of plain values (marshal-able)
+        return (self.tick, self.hit_pause,
+                self.player.snapshot(),
+                tuple(dummy.snapshot() for dummy in self.dummies),
+                self.crowd.snapshot(),
+                self.controls.snapshot(),
+                None if self.bigboy is None else (self.bigboy.snapshot(), self.p2_controls.snapshot()))
+
+    def Restore(self, snap):
+        self.tick, self.hit_pause, player, dummies, crowd, controls, p2 = snap
+        self.player.restore(player)
+        for dummy, state in zip(self.dummies, dummies):
+            dummy.restore(state)
+        self.crowd.restore(crowd)
+        self.controls.restore(controls)
+        if p2 is not None:
+            self.bigboy.restore(p2[0])
+            self.p2_controls.restore(p2[1])
+
+    def Advance(self):
+        # one sim tick; False if it can't run yet (netplay waiting on the other cabinet)
+        if self.netplay is not None:
+            return self.netplay.Frame()
+        self.Step()
+        return True
 
+    def StartRecording(self, recorder):
+        # recorder: replay.ReplayRecorder; gets every key event the sim consumes
+        self.recorder = recorder
+        self.controls.recorder = recorder
+        recorder.snapshot(self.tick, self.Snapshot())
+
+    def SaveReplay(self):
+        if self.recorder is not None:
+            self.recorder.ticks = self.tick
+            print("saved", self.recorder.save())
+
+    def StartCapture(self, frames, memory=False):
+        # profile the next `frames` frames (ticks when headless); memory = tracemalloc diff too
+        if self.capture is None:
+            self.capture = Capture(frames, memory=memory).start()
+
+    def Run(self, ticks):
+        # headless: step the sim as fast as it goes, no rendering, no frame cap
+        for _ in range(ticks):
+            self.EventHandler()
+            self.Advance()
+            if self.capture is not None and self.capture.frame_done():
+                self.capture = None
 
     def Loop(self):
-        while True:
-            if self.hit_pause > 0:
-                self.hit_pause -= 1
-                self.DisplayHandler()
-                continue
-            dt = self.clock.tick(FPS) / 1000.0
+        if self.headless:
+            while True:
+                self.Run(TICK_RATE)
 
+        while True:
+            frame_ms = self.clock.tick(FPS)
+            self.accumulator += frame_ms
+            self.stats.begin()
 
             self.EventHandler()
-            self.UpdateHandler()
+            if self.hotreload is not None:
+                self.hotreload.apply()
+            self.stats.mark("events")
+
+            # fixed-timestep sim, decoupled from render rate
+            steps = 0
+            while self.accumulator >= TICK_MS and steps < MAX_STEPS:
+                if not self.Advance():
+                    self.accumulator = min(self.accumulator, TICK_MS)
+                    break  # stalled on the network, try again next frame
+                self.accumulator -= TICK_MS
+                steps += 1
+            if steps == MAX_STEPS:
+                # stalled: drop the backlog instead of spiralling
+                self.accumulator = min(self.accumulator, TICK_MS)
+            self.stats.mark("update")
+
+            alpha = 1.0 if self.hit_pause > 0 else self.accumulator / TICK_MS
+            self.DisplayHandler(alpha)
+            self.stats.end(frame_ms)
+
+            if self.startup is not None:
+                self.startup.mark("first frame")
+                self.startup.report()
+                self.startup = None
 
-            self.DisplayHandler()
+            if self.capture is not None and self.capture.frame_done():
+                self.capture = None
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+import runpy
+import threading
+from collections import deque
+from assets.src import sprites, states
+from assets.src import config
+
+# Watch mode (--watch): edit a sprite, a character's data file or config.py
+# and see it in the running game without losing the match.
+# A daemon thread stats the watched files every `interval` seconds and queues
+# what changed; GAME calls apply() once per frame on the main thread, which
+# drops just those Surfaces from the sprite cache, rebuilds the affected
+# character tables and rebinds the fighters' AnimStates to them in place.
+
+WATCH_DIRS = ("assets/sprites", "assets/data")
+CONFIG_PATH = "assets/src/config.py"
+
+# these are baked into the window / clock / mixer at startup
+RESTART_ONLY = {"FPS", "width", "height", "RES", "WINDOW_SIZE", "SCALE_FILTER", "FULLSCREEN",
+                "STAGE_WIDTH", "TICK_RATE", "TICK_MS", "TICK_DT",
+                "AUDIO_FREQ", "AUDIO_BUFFER", "AUDIO_VOICES", "PARTICLE_CAPACITY"}
+
+
+class FileWatcher:
+    """
+    Polls (mtime, size) of every file under `dirs` plus `files` on a daemon
+    thread. Changed / new / deleted paths pile up in `changes` (a deque, so
+    the main thread can pop without locking).
+    """
+    def __init__(self, dirs=WATCH_DIRS, files=(CONFIG_PATH,), interval=0.05):
+        self.dirs = dirs
+        self.files = files
+        self.interval = interval
+        self.changes = deque()
+        self.seen = self._scan()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="hot-reload", daemon=True)
+        self.thread.start()
+
+    def _scan(self):
+        seen = {}
+        paths = list(self.files)
+        for folder in self.dirs:
+            for root, _, names in os.walk(folder):
+                paths.extend(os.path.join(root, n) for n in names)
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            seen[os.path.normpath(path)] = (st.st_mtime_ns, st.st_size)
+        return seen
+
+    def _run(self):
+        while self.running:
+            time.sleep(self.interval)
+            now = self._scan()
+            for path, stamp in now.items():
+                if self.seen.get(path) != stamp:
+                    self.changes.append(path)
+            for path in self.seen.keys() - now.keys():
+                self.changes.append(path)
+            self.seen = now
+
+    def stop(self):
+        self.running = False
+
+
+class HotReload:
+    """
+    Main-thread side: GAME.Loop calls apply() every frame (one deque check
+    when nothing changed).
+    """
+    def __init__(self, game, watcher=None):
+        self.game = game
+        self.watcher = watcher or FileWatcher()
+
+    def apply(self):
+        changes = self.watcher.changes
+        if not changes:
+            return
+        start = time.perf_counter()
+        paths = set()
+        while changes:
+            paths.add(changes.popleft())
+        count = len(paths)
+
+        norm_config = os.path.normpath(CONFIG_PATH)
+        if norm_config in paths:
+            paths.discard(norm_config)
+            self.reload_config()
+        if paths:
+            self.reload_assets(paths)
+        print(f"reloaded {count} file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def reload_assets(self, paths):
+        for path in paths:
+            sprites.forget(path)
+            folder = os.path.dirname(path)
+            if path.endswith(".png") and ".atlas." not in path and os.path.exists(folder + ".atlas.json"):
+                # frames in a packed folder are read from the atlas
+                print(f"{path} is packed: run convert_sprites --pack {folder} to see it")
+
+        def affected(data):
+            sprite_dir = os.path.normpath(data.sprite_dir)
+            return any(os.path.normpath(data.path) == path or path.startswith(sprite_dir)
+                       for path in paths)
+
+        swapped = states.reload_characters(affected)
+        game = self.game
+        for fighter in (game.player, game.bigboy):
+            if fighter is not None and fighter.anim.data in swapped:
+                fighter.anim.rebind(swapped[fighter.anim.data])
+                fighter.image = fighter.anim.image()
+
+    def reload_config(self):
+        try:
+            values = runpy.run_path(CONFIG_PATH)
+        except Exception as e:  # half-saved file, typo...: keep the old values
+            print(f"reload {CONFIG_PATH} failed: {e!r}")
+            return
+
+        changed = {name: value for name, value in values.items()
+                   if not name.startswith("_") and getattr(config, name, None) != value}
+        old = {name: getattr(config, name, None) for name in changed}
+        needs_restart = sorted(changed.keys() & RESTART_ONLY)
+        if needs_restart:
+            print("restart to apply:", ", ".join(needs_restart))
+        for name, value in changed.items():
+            if name in RESTART_ONLY:
+                continue
+            # modules took copies with `from config import *`, update those too
+            for module in list(sys.modules.values()):
+                if (getattr(module, "__name__", "").startswith("assets.") and hasattr(module, name)
+                        and getattr(module, name) == old[name]):
+                    setattr(module, name, value)
+            setattr(config, name, value)
+            print(f"{name} = {value!r}")
+
+        game = self.game
+        if "INPUT_BUFFER_TICKS" in changed:
+            game.controls.buffer_ticks = changed["INPUT_BUFFER_TICKS"]
+        if "BG" in changed:
+            renderer = game.renderer
+            renderer.stage = game.BuildStage()
+            renderer.bg = renderer.stage.get_at((0, 0))
+            renderer.invalidate()
@@ -0,0 +1,137 @@
+import time
+import threading
+import pygame
+from assets.src.config import BG
+
+# Startup: the window opens first, then the sprites/audio decode on a
+# background thread while the main thread keeps drawing a progress bar
+# (and pumping events, so the OS doesn't mark us as hung).
+# The caches they fill (sprites._cache, states._characters) are only read by
+# the main thread once the loader is done, so there is no locking.
+
+
+class StartupLog:
+    """
+    Wall-clock time of each startup phase, printed once the first frame is up.
+      mark(name)  end of a phase (ms since the previous mark)
+      jobs        (name, ms) of the individual asset loads, for the breakdown
+    """
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.phases = []
+        self.jobs = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def total_ms(self):
+        return (self._last - self.start) * 1000
+
+    def report(self):
+        parts = "  ".join(f"{name} {ms:.0f}" for name, ms in self.phases)
+        print(f"startup {self.total_ms():.0f} ms: {parts}")
+        if self.jobs:
+            print("  assets: " + "  ".join(f"{name} {ms:.0f}" for name, ms in self.jobs))
+
+
+class AssetLoader:
+    """
+    Runs load jobs one after another on a daemon thread.
+      add(name, fn)  queue a job; fn's return value ends up in results[name]
+      start()        kick off the thread
+      progress       0..1, for the loading screen
+      check()        re-raises a job's exception on the calling thread
+    """
+    def __init__(self):
+        self.jobs = []
+        self.results = {}
+        self.timings = []   # (name, ms) per finished job
+        self.finished = 0
+        self.current = None
+        self.error = None
+        self.thread = None
+
+    def add(self, name, fn):
+        self.jobs.append((name, fn))
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        for name, fn in self.jobs:
+            self.current = name
+            start = time.perf_counter()
+            try:
+                self.results[name] = fn()
+            except Exception as e:
+                self.error = (name, e)
+                return
+            self.timings.append((name, (time.perf_counter() - start) * 1000))
+            self.finished += 1
+        self.current = None
+
+    @property
+    def progress(self):
+        return self.finished / len(self.jobs) if self.jobs else 1.0
+
+    @property
+    def done(self):
+        return self.thread is not None and not self.thread.is_alive()
+
+    def check(self):
+        if self.error is not None:
+            name, e = self.error
+            raise RuntimeError(f"loading {name!r} failed") from e
+
+    def wait(self):
+        # block until everything is loaded (headless: nothing to draw meanwhile)
+        self.thread.join()
+        self.check()
+        return self.results
+
+
+class LoadingScreen:
+    """
+    Progress bar + the name of what is loading. No assets of its own, so it
+    can be up on the first frame. output: render.Display (None = screen is the window).
+    """
+    def __init__(self, screen, size=(400, 16), output=None):
+        self.screen = screen
+        self.size = size
+        self.output = output
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 24)
+
+    def draw(self, progress, label=None):
+        screen = self.screen
+        screen.fill(BG)
+        w, h = self.size
+        bar = pygame.Rect(0, 0, w, h)
+        bar.center = screen.get_rect().center
+        pygame.draw.rect(screen, (40, 40, 40), bar)
+        pygame.draw.rect(screen, (255, 200, 60), (bar.x, bar.y, int(w * progress), h))
+        pygame.draw.rect(screen, (255, 255, 255), bar, 1)
+        if label:
+            text = self.font.render(label, True, (255, 255, 255))
+            screen.blit(text, text.get_rect(midtop=(bar.centerx, bar.bottom + 8)))
+        if self.output is not None:
+            self.output.present()
+        else:
+            pygame.display.flip()
+
+    def run(self, loader, fps=30):
+        # main-thread side: keep the window alive until the loader is done
+        clock = pygame.time.Clock()
+        while not loader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    raise SystemExit
+            self.draw(loader.progress, loader.current)
+            clock.tick(fps)
+        loader.check()
+        self.draw(1.0)
+        return loader.results
@@ -0,0 +1,196 @@
+import socket
+import struct
+from assets.src.config import NETPLAY_MAX_ROLLBACK
+from assets.src.controls import TickInput, key_mask
+
+# Rollback netplay between two cabinets.
+# Player 1 is PLAYER, player 2 is BigBoy; `side` says which one is local.
+# Every tick both sims get a SIM_KEYS mask per player. The local one is
+# known, the remote one is predicted (= its last confirmed input) until the
+# other cabinet's packet arrives; if the guess was wrong we restore the
+# snapshot from before that tick and re-run up to now with the real input.
+# Packets carry every local input the peer hasn't acked yet, so a lost
+# packet is covered by the next one.
+#   packet: ack i32 (last remote tick we have), start i32, count u16, count x mask u16
+
+PACKET = struct.Struct("<iiH")
+MAX_SEND = 64
+
+
+class UdpTransport:
+    """
+    Non-blocking UDP socket to one peer. host = local address to bind:
+    127.0.0.1 only reaches this machine (loopback.py), "" = every interface
+    (two cabinets, see main.py --bind).
+    """
+    def __init__(self, port, peer, host="127.0.0.1"):
+        self.peer = peer
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.last_error = None
+
+    def send(self, data):
+        try:
+            self.sock.sendto(data, self.peer)
+        except ConnectionRefusedError:
+            pass  # peer not up yet: the next packet resends everything
+        except OSError as e:
+            # can't get there at all (wrong bind address, no route...): say so once
+            if e.errno != self.last_error:
+                self.last_error = e.errno
+                print(f"netplay: sending to {self.peer[0]}:{self.peer[1]} failed: {e}")
+
+    def receive(self):
+        packets = []
+        while True:
+            try:
+                data, _ = self.sock.recvfrom(2048)
+            except BlockingIOError:
+                return packets
+            except (ConnectionResetError, ConnectionRefusedError):
+                continue  # an earlier send bounced (peer not up yet)
+            packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class RollbackSession:
+    """
+    Drives GAME one tick per Frame() (GAME.Advance calls it).
+      local      the input source for this cabinet (Keyboard, ScriptedInput...)
+      transport  send(bytes) / receive() -> [bytes]
+      side       0 = we are player 1 (PLAYER), 1 = player 2 (BigBoy)
+    The game has to be built with TickInputs for both players (see attach()).
+    """
+    def __init__(self, game, local, transport, side=0, max_rollback=NETPLAY_MAX_ROLLBACK):
+        self.game = game
+        self.local = local
+        self.transport = transport
+        self.side = side
+        self.max_rollback = max_rollback
+        self.players = (game.controls, game.p2_controls)
+
+        self.tick = game.tick         # next tick to run
+        self.local_masks = {}         # tick -> our input (until acked and past rollback range)
+        self.remote_masks = {}        # tick -> their confirmed input
+        self.predicted = {}           # tick -> what we assumed they pressed
+        self.confirmed = game.tick - 1  # every remote input up to here is known
+        self.peer_ack = game.tick - 1   # every local input up to here got there
+        self.pruned = game.tick         # local_masks below this are gone
+        self.remote_pruned = game.tick  # remote_masks / predicted below this are gone
+
+        # state before tick t lives at t % size
+        self.size = max_rollback + 1
+        self.states = [None] * self.size
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+
+    @classmethod
+    def attach(cls, game_cls, local, transport, side=0, **game_args):
+        # build a GAME wired for netplay: both players on TickInputs, real keys to `local`
+        game = game_cls(controls=TickInput(), p2_controls=TickInput(), **game_args)
+        session = cls(game, local, transport, side)
+        game.netplay = session
+        game.keyboard = local
+        game.latency_input = session.players[side]  # F1/F2 input latency = our player
+        return session
+
+    # --- network ---
+    def _send(self):
+        start = self.peer_ack + 1
+        count = min(self.tick - start, MAX_SEND)
+        masks = [self.local_masks[t] for t in range(start, start + count)]
+        self.transport.send(PACKET.pack(self.confirmed, start, count) + struct.pack("<%dH" % count, *masks))
+
+    def Poll(self):
+        # take in the peer's packets; roll back if one of our guesses was wrong
+        first_wrong = None
+        for data in self.transport.receive():
+            ack, start, count = PACKET.unpack_from(data)
+            masks = struct.unpack_from("<%dH" % count, data, PACKET.size)
+            if ack > self.peer_ack:
+                self.peer_ack = ack
+            for i, mask in enumerate(masks):
+                t = start + i
+                if t != self.confirmed + 1:
+                    continue  # old, or a gap (the next packet resends it)
+                self.remote_masks[t] = mask
+                self.confirmed = t
+                guess = self.predicted.pop(t, None)
+                if guess is not None and guess != mask and first_wrong is None:
+                    first_wrong = t
+        if first_wrong is not None:
+            self._rollback(first_wrong)
+
+        # their inputs from before the rollback window (by our tick: a peer
+        # that's ahead can confirm ticks we still have to replay). Keep the
+        # last confirmed one, predictions repeat it
+        horizon = min(self.tick - self.max_rollback, self.confirmed)
+        while self.remote_pruned < horizon:
+            self.remote_masks.pop(self.remote_pruned, None)
+            self.predicted.pop(self.remote_pruned, None)
+            self.remote_pruned += 1
+
+        # our inputs the peer has and that no rollback can reach any more
+        while self.pruned <= min(self.peer_ack, self.confirmed):
+            self.local_masks.pop(self.pruned, None)
+            self.pruned += 1
+
+    # --- sim ---
+    def _remote(self, t):
+        mask = self.remote_masks.get(t)
+        if mask is None:
+            # predict: they keep doing what they last did
+            mask = self.remote_masks.get(self.confirmed, 0)
+            self.predicted[t] = mask
+        return mask
+
+    def _simulate(self, t):
+        game = self.game
+        self.states[t % self.size] = game.Snapshot()
+        local, remote = self.local_masks[t], self._remote(t)
+        # stamp our presses with when the key really went down (first run only)
+        stamps = None if game.resimulating else self.local.press_time
+        if self.side == 0:
+            self.players[0].feed(local, stamps)
+            self.players[1].feed(remote)
+        else:
+            self.players[0].feed(remote)
+            self.players[1].feed(local, stamps)
+        game.Step()
+
+    def _rollback(self, t):
+        game = self.game
+        game.Restore(self.states[t % self.size])
+        game.resimulating = True
+        for player in self.players:
+            player.timing = False
+        for k in range(t, self.tick):
+            self._simulate(k)
+        for player in self.players:
+            player.timing = True
+        game.resimulating = False
+        self.rollbacks += 1
+        self.resimulated += self.tick - t
+
+    def Frame(self):
+        """
+        Runs the next tick. Returns False (and runs nothing) when the other
+        cabinet is more than max_rollback ticks behind; we wait for it then.
+        """
+        self.Poll()
+        if self.tick - self.confirmed > self.max_rollback:
+            self.stalls += 1
+            self._send()
+            return False
+
+        self.local_masks[self.tick] = key_mask(self.local)
+        self.local.advance()
+        self._send()
+        self._simulate(self.tick)
+        self.tick += 1
+        return True
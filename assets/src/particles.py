@@ -0,0 +1,150 @@
+import numpy as np
+import pygame
+from assets.src.config import PARTICLE_CAPACITY
+
+# Hit feedback: dust and sweat bursts.
+# Every particle lives in one set of fixed-size NumPy arrays used as a ring:
+# a burst writes over the next `count` slots (the oldest ones), a particle
+# dies when its life runs out and its slot is simply left until reused.
+# So spawning is a few slice copies, expiring is nothing at all, and step()
+# is the same dozen in-place array ops whether 10 or 4000 are alive.
+
+DUST = 0
+SWEAT = 1
+
+# kind -> (color, radius px, speed px/tick, spread radians, angle, life ticks, gravity px/tick^2)
+# angle 0 = along the burst direction, -pi/2 = straight up
+KINDS = {
+    DUST:  ((196, 176, 140), 4, (1.5, 4.5), 1.2, -0.35, (14, 26), 0.10),
+    SWEAT: ((150, 205, 255), 2, (3.0, 7.0), 1.0, -1.0, (18, 32), 0.45),
+}
+FADES = 4      # sizes a particle shrinks through as it dies (one pre-made Surface each)
+DRAG = 0.92
+TABLE = 1024   # pre-rolled random bursts per kind
+
+
+class ParticlePool:
+    """
+    Fixed pool of `capacity` particles (PARTICLE_CAPACITY). GAME calls
+    burst() on impacts, step() once per sim tick and draw() once per frame.
+    Purely visual: not part of GAME.Snapshot.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, floor=None, seed=0):
+        self.capacity = capacity
+        self.floor = float(floor) if floor is not None else float("inf")  # particles settle here
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.old_x = np.zeros(capacity, dtype=np.float32)
+        self.old_y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32)     # ticks left, <= 0 = free
+        self.frame = np.zeros(capacity, dtype=np.int32)    # first image of its kind
+        self.head = 0   # next slot a burst writes to
+        self.busy = 0   # ticks until the last particle dies (0 = nothing to step or draw)
+
+        # random velocities / lifetimes rolled once; bursts take the next slice
+        rng = np.random.default_rng(seed)
+        self.tables = {}
+        self.cursor = {}
+        self.radius = max(k[1] for k in KINDS.values())  # every dot is drawn centred in 2*radius
+        self.images = []
+        for kind, (color, radius, (lo, hi), spread, angle, (life_lo, life_hi), _) in KINDS.items():
+            theta = angle + (rng.random(TABLE) - 0.5) * spread
+            speed = lo + rng.random(TABLE) * (hi - lo)
+            self.tables[kind] = (
+                (np.cos(theta) * speed).astype(np.float32),
+                (np.sin(theta) * speed).astype(np.float32),
+                rng.integers(life_lo, life_hi + 1, TABLE).astype(np.int32),
+            )
+            self.cursor[kind] = 0
+            self.images.extend(self._dots(color, radius))
+
+    def _dots(self, color, radius):
+        # one dot per fade step, smallest first. Colorkey only: surface alpha
+        # made blits ~4x slower with thousands of dots
+        size = self.radius * 2
+        dots = []
+        for step in range(FADES):
+            dot = pygame.Surface((size, size))
+            dot.fill((0, 0, 0))
+            dot.set_colorkey((0, 0, 0))
+            pygame.draw.circle(dot, color, (self.radius, self.radius), max(1, radius * (step + 1) // FADES))
+            dots.append(dot)
+        return dots
+
+    def burst(self, kind, pos, direction=1, count=8):
+        """
+        `count` particles of `kind` from pos (world px), thrown toward
+        direction (1 = right, -1 = left).
+        """
+        count = min(count, self.capacity, TABLE)
+        start = self.head
+        if start + count > self.capacity:
+            start = 0
+        end = start + count
+        self.head = end
+
+        t = self.cursor[kind]
+        if t + count > TABLE:
+            t = 0
+        self.cursor[kind] = t + count
+        table_vx, table_vy, table_life = self.tables[kind]
+
+        x, y = pos
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.old_x[start:end] = x
+        self.old_y[start:end] = y
+        np.multiply(table_vx[t:t + count], direction, out=self.vx[start:end])
+        self.vy[start:end] = table_vy[t:t + count]
+        self.life[start:end] = table_life[t:t + count]
+        self.gravity[start:end] = KINDS[kind][6]
+        self.frame[start:end] = kind * FADES
+        self.busy = max(self.busy, int(table_life[t:t + count].max()))
+
+    def step(self):
+        if not self.busy:
+            return
+        self.busy -= 1
+        np.copyto(self.old_x, self.x)
+        np.copyto(self.old_y, self.y)
+        self.vy += self.gravity
+        self.vx *= DRAG
+        self.x += self.vx
+        self.y += self.vy
+        np.minimum(self.y, self.floor, out=self.y)
+        self.life -= 1
+
+    def clear(self):
+        self.life[:] = 0
+        self.busy = 0
+
+    def draw(self, screen, view, alpha=1.0, offset=(0, 0)):
+        """
+        Blits every live particle inside view (world rect) in one
+        Surface.blits call. Returns the screen rect around them (or None).
+        """
+        if not self.busy:
+            return None
+        px = self.old_x + (self.x - self.old_x) * alpha
+        py = self.old_y + (self.y - self.old_y) * alpha
+        idx = np.flatnonzero((self.life > 0) & (px > view.left) & (px < view.right) &
+                             (py > view.top) & (py < view.bottom))
+        if not len(idx):
+            return None
+
+        # shrink away over the last FADES * 4 ticks
+        frames = self.frame[idx] + np.minimum(self.life[idx] // 4, FADES - 1)
+        sx = px[idx].astype(np.int32) + (offset[0] - self.radius)
+        sy = py[idx].astype(np.int32) + (offset[1] - self.radius)
+        images = self.images
+        screen.blits(zip(map(images.__getitem__, frames.tolist()), zip(sx.tolist(), sy.tolist())),
+                     doreturn=False)
+
+        pad = 2 * self.radius
+        left, top = int(sx.min()), int(sy.min())
+        area = pygame.Rect(left, top, int(sx.max()) - left + pad, int(sy.max()) - top + pad)
+        return area.clip(screen.get_rect())
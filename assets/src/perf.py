@@ -0,0 +1,166 @@
+import csv
+import json
+import time
+import pygame
+
+# Frame-time instrumentation (always on, a few perf_counter calls per frame)
+# + the F1 overlay that shows it. F2 dumps the samples to CSV/JSON.
+# Also input-to-present latency, one sample per press the sim acted on.
+
+PHASES = ("events", "update", "display", "flip")
+
+
+class FrameStats:
+    """
+    Per-phase timings for the last `size` frames in fixed-size ring buffers.
+      begin()        top of the frame
+      mark(phase)    end of a phase (ms since the previous mark)
+      end(frame_ms)  bottom of the frame; frame_ms = what clock.tick said
+      input(ms, frames)  a press reached the screen (EventInput.presented)
+    """
+    def __init__(self, size=600, budget_ms=1000 / 60):
+        self.size = size
+        self.budget_ms = budget_ms
+        self.phase_ms = {p: [0.0] * size for p in PHASES}
+        self.frame_ms = [0.0] * size
+        self.count = 0
+        self.dropped = 0
+        self._last = 0.0
+        # input latency, last `size` presses
+        self.input_ms = [0.0] * size
+        self.input_frames = [0] * size
+        self.input_count = 0
+
+    def begin(self):
+        self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phase_ms[phase][self.count % self.size] = (now - self._last) * 1000
+        self._last = now
+
+    def end(self, frame_ms):
+        self.frame_ms[self.count % self.size] = frame_ms
+        # missed at least one vsync-sized slot
+        if frame_ms > self.budget_ms * 1.5:
+            self.dropped += 1
+        self.count += 1
+
+    def input(self, ms, frames):
+        i = self.input_count % self.size
+        self.input_ms[i] = ms
+        self.input_frames[i] = frames
+        self.input_count += 1
+
+    def _ring(self, data, count):
+        n = min(count, self.size)
+        start = count % self.size if count > self.size else 0
+        return [data[(start + i) % self.size] for i in range(n)]
+
+    def input_samples(self):
+        # [(ms, frames), ...] oldest -> newest
+        return list(zip(self._ring(self.input_ms, self.input_count),
+                        self._ring(self.input_frames, self.input_count)))
+
+    def samples(self, series=None):
+        # oldest -> newest
+        data = self.frame_ms if series is None else self.phase_ms[series]
+        return self._ring(data, self.count)
+
+    def summary(self):
+        s = sorted(self.samples())
+        if not s:
+            summary = {"p50": 0.0, "p99": 0.0, "max": 0.0, "dropped": self.dropped}
+        else:
+            summary = {"p50": s[len(s) // 2],
+                       "p99": s[min(len(s) - 1, int(len(s) * 0.99))],
+                       "max": s[-1],
+                       "dropped": self.dropped}
+        inputs = self.input_samples()
+        ms = sorted(m for m, _ in inputs)
+        summary["input_presses"] = self.input_count
+        summary["input_p50_ms"] = ms[len(ms) // 2] if ms else 0.0
+        summary["input_max_ms"] = ms[-1] if ms else 0.0
+        summary["input_max_frames"] = max((f for _, f in inputs), default=0)
+        return summary
+
+    def rows(self):
+        cols = [self.samples()] + [self.samples(p) for p in PHASES]
+        return [dict(zip(("frame",) + PHASES, values)) for values in zip(*cols)]
+
+    def export(self, base):
+        # -> base.csv + base_input.csv + base.json, returns the paths
+        rows = self.rows()
+        inputs = [{"ms": ms, "frames": frames} for ms, frames in self.input_samples()]
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=("frame",) + PHASES)
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(base + "_input.csv", "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=("ms", "frames"))
+            writer.writeheader()
+            writer.writerows(inputs)
+        with open(base + ".json", "w") as f:
+            json.dump({"summary": self.summary(), "budget_ms": self.budget_ms, "frames": rows,
+                       "input": inputs}, f, indent=1)
+        return base + ".csv", base + "_input.csv", base + ".json"
+
+
+class PerfOverlay:
+    """
+    Text + frame-time graph in the top-left corner. Text is only re-rendered
+    every few frames so the overlay itself doesn't show up in the numbers.
+    """
+    def __init__(self, pos=(8, 8), graph_size=(240, 60), refresh=10):
+        self.pos = pos
+        self.graph_size = graph_size
+        self.refresh = refresh
+        self.font = None
+        self.text = None
+        self.frames = 0
+
+    def _render_text(self, stats):
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, 18)
+        s = stats.summary()
+        last = stats.count - 1
+        phases = "  ".join(f"{p} {stats.phase_ms[p][last % stats.size]:.2f}" for p in PHASES)
+        lines = [f"p50 {s['p50']:.1f}  p99 {s['p99']:.1f}  max {s['max']:.1f} ms  dropped {s['dropped']}",
+                 phases]
+        if stats.input_count:
+            i = (stats.input_count - 1) % stats.size
+            lines.append(f"input {stats.input_ms[i]:.1f} ms / {stats.input_frames[i]} frame(s)"
+                         f"  p50 {s['input_p50_ms']:.1f}  max {s['input_max_ms']:.1f} ms")
+        surfs = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        w = max(sf.get_width() for sf in surfs)
+        h = sum(sf.get_height() for sf in surfs)
+        text = pygame.Surface((w, h), pygame.SRCALPHA)
+        y = 0
+        for sf in surfs:
+            text.blit(sf, (0, y))
+            y += sf.get_height()
+        self.text = text
+
+    def draw(self, screen, stats):
+        # returns the area touched (for the dirty-rect renderer)
+        if self.text is None or self.frames % self.refresh == 0:
+            self._render_text(stats)
+        self.frames += 1
+
+        x, y = self.pos
+        gw, gh = self.graph_size
+        box = pygame.Rect(x, y, max(gw, self.text.get_width()) + 8, self.text.get_height() + gh + 12)
+        screen.fill((0, 0, 0), box)
+        screen.blit(self.text, (x + 4, y + 4))
+
+        # frame-time graph, budget line = one frame at the target rate
+        gx, gy = x + 4, y + self.text.get_height() + 8
+        scale = gh / (stats.budget_ms * 3)
+        pygame.draw.line(screen, (80, 160, 80), (gx, gy + gh - stats.budget_ms * scale),
+                         (gx + gw, gy + gh - stats.budget_ms * scale))
+        samples = stats.samples()[-gw:]
+        if len(samples) > 1:
+            points = [(gx + i, gy + gh - min(gh, ms * scale)) for i, ms in enumerate(samples)]
+            pygame.draw.lines(screen, (255, 200, 60), False, points)
+        return box
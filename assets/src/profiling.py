@@ -0,0 +1,98 @@
+import time
+import pstats
+import cProfile
+import tracemalloc
+
+# On-demand profiling of the next N frames (F3 in game, --profile N on the
+# command line). Nothing is hooked in while no capture is running; GAME
+# only checks `self.capture is not None` once per frame.
+
+
+class Capture:
+    """
+    Profiles `frames` frames with cProfile (+ optional tracemalloc diff), then writes
+      <base>.pstats      load with pstats / snakeviz
+      <base>.collapsed   "a;b;c <microseconds>" lines for flamegraph.pl / speedscope
+      <base>_mem.txt     top allocation growth over the window (memory=True)
+    """
+    def __init__(self, frames, base=None, memory=False):
+        self.remaining = frames
+        self.base = base or time.strftime("profile_%Y%m%d_%H%M%S")
+        self.memory = memory
+        self.profiler = cProfile.Profile()
+        self.snapshot = None
+
+    def start(self):
+        if self.memory:
+            tracemalloc.start(25)
+            self.snapshot = tracemalloc.take_snapshot()
+        self.profiler.enable()
+        return self
+
+    def frame_done(self):
+        # -> True once the capture is finished and written
+        self.remaining -= 1
+        if self.remaining > 0:
+            return False
+        self.stop()
+        return True
+
+    def stop(self):
+        self.profiler.disable()
+        self.profiler.dump_stats(self.base + ".pstats")
+        write_collapsed(pstats.Stats(self.profiler), self.base + ".collapsed")
+        print("saved", self.base + ".pstats", self.base + ".collapsed")
+
+        if self.memory:
+            after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            with open(self.base + "_mem.txt", "w") as f:
+                for stat in after.compare_to(self.snapshot, "lineno")[:50]:
+                    f.write(f"{stat}\n")
+            print("saved", self.base + "_mem.txt")
+
+
+def _label(func):
+    filename, line, name = func
+    return f"{name} ({filename}:{line})"
+
+
+def write_collapsed(stats, path, max_depth=64):
+    """
+    cProfile only keeps caller -> callee pairs, not whole stacks, so stacks
+    are rebuilt by walking down from the roots and splitting each callee's
+    time between its callers in proportion to the time spent under each.
+    """
+    raw = stats.stats  # func -> (cc, nc, tt, ct, callers{caller: (cc, nc, tt, ct)})
+    callees = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge))
+
+    lines = {}
+
+    def walk(func, stack, path_ct, path_tt):
+        # path_ct / path_tt: func's total / own time on this particular stack
+        if path_ct < 1e-6:
+            return  # < 1 us on this stack, not worth a line
+        stack = stack + (_label(func),)
+        us = int(path_tt * 1e6)
+        if us > 0:
+            key = ";".join(stack)
+            lines[key] = lines.get(key, 0) + us
+        total_ct = raw[func][3]
+        if len(stack) >= max_depth or total_ct <= 0:
+            return
+        share = min(1.0, path_ct / total_ct)
+        for callee, edge in callees.get(func, ()):
+            if _label(callee) in stack:
+                continue  # recursion: stop here
+            walk(callee, stack, edge[3] * share, edge[2] * share)
+
+    for func, (_, _, tt, ct, callers) in raw.items():
+        if not callers:
+            walk(func, (), ct, tt)
+
+    with open(path, "w") as f:
+        for key, us in sorted(lines.items()):
+            f.write(f"{key} {us}\n")
@@ -0,0 +1,147 @@
+import pygame
+
+
+class Display:
+    """
+    The real window. The game draws into `surface` (internal size) and
+    present() puts it on the window in a single scaling pass:
+      integer  largest whole-number zoom that fits, centred; only the dirty
+               areas are scaled (pixel-exact, so that's the same picture).
+               Falls back to smooth when that zoom would be 1 (e.g. 800x600
+               on a 1080p window) or the window is smaller than the game
+      smooth   fits the window (keeping aspect), whole frame smoothscaled
+    If the window is the internal size, `surface` is the window itself and
+    there is no extra pass.
+    """
+    def __init__(self, internal_size, window_size=None, filter="integer", fullscreen=False):
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if window_size is None:
+            window_size = (0, 0) if fullscreen else internal_size  # (0, 0) = desktop size
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.filter = filter
+
+        ww, wh = self.window.get_size()
+        iw, ih = internal_size
+        self.direct = (ww, wh) == (iw, ih)
+        if self.direct:
+            self.surface = self.window
+            self.zoom = 1
+            self.dest = self.window.get_rect()
+            return
+
+        self.surface = pygame.Surface(internal_size).convert()
+        if filter == "integer" and min(ww // iw, wh // ih) < 2:
+            # a 1x picture in a big black frame isn't what anyone wants
+            self.filter = filter = "smooth"
+        if filter == "integer":
+            self.zoom = min(ww // iw, wh // ih)
+            size = (iw * self.zoom, ih * self.zoom)
+        else:
+            self.zoom = min(ww / iw, wh / ih)
+            size = (int(iw * self.zoom), int(ih * self.zoom))
+        self.dest = pygame.Rect((0, 0), size)
+        self.dest.center = self.window.get_rect().center
+        self.target = self.window.subsurface(self.dest)
+        self.window.fill((0, 0, 0))  # letterbox bars
+
+    def present(self, rects=None):
+        # rects: internal-surface areas that changed, None = the whole frame
+        if self.direct:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+
+        if rects is None or self.filter != "integer":
+            if self.filter == "integer":
+                pygame.transform.scale(self.surface, self.dest.size, self.target)
+            else:
+                pygame.transform.smoothscale(self.surface, self.dest.size, self.target)
+            pygame.display.flip()
+            return
+
+        zoom = self.zoom
+        bounds = self.surface.get_rect()
+        dx, dy = self.dest.topleft
+        updated = []
+        for r in rects:
+            r = r.clip(bounds)
+            if not r:
+                continue
+            area = pygame.Rect(r.x * zoom, r.y * zoom, r.w * zoom, r.h * zoom)
+            pygame.transform.scale(self.surface.subsurface(r), area.size, self.target.subsurface(area))
+            updated.append(area.move(dx, dy))
+        pygame.display.update(updated)
+
+
+class Renderer:
+    """
+    Dirty-rectangle compositor.
+      - the static stage (background + walls) is pre-rendered once
+      - each frame only the areas sprites covered last frame get restored
+        from it, and only old + new sprite areas get pushed to the display
+      - screen shake is just a different composite offset; changing the
+        offset repaints the whole frame once (no screen-to-screen copy)
+    Sprites report what they touched by returning the blit/draw rect.
+    output: the Display that puts `screen` on the window (None = screen is the window).
+    """
+    def __init__(self, screen, stage, output=None):
+        self.screen = screen
+        self.stage = stage
+        self.output = output
+        self.bg = stage.get_at((0, 0))
+        self.offset = None     # composite offset used for the last frame
+        self.full = True       # next present() pushes the whole screen
+        self.restored = []     # stage areas repainted this frame
+        self.drawn = []        # sprite areas drawn this frame
+        self.last_drawn = []   # sprite areas drawn last frame
+
+    def invalidate(self):
+        # e.g. after something drew over the whole screen
+        self.offset = None
+
+    def begin(self, offset=(0, 0)):
+        self.drawn = []
+        if offset != self.offset:
+            self._repaint(offset)
+            self.restored = []
+            self.full = True
+        else:
+            ox, oy = offset
+            blit = self.screen.blit
+            stage = self.stage
+            self.restored = [blit(stage, r, r.move(-ox, -oy)) for r in self.last_drawn]
+        self.offset = offset
+
+    def _repaint(self, offset):
+        ox, oy = offset
+        w, h = self.screen.get_size()
+        # fill only the strips the shifted stage doesn't cover
+        if ox > 0:
+            self.screen.fill(self.bg, (0, 0, ox, h))
+        elif ox < 0:
+            self.screen.fill(self.bg, (w + ox, 0, -ox, h))
+        if oy > 0:
+            self.screen.fill(self.bg, (0, 0, w, oy))
+        elif oy < 0:
+            self.screen.fill(self.bg, (0, h + oy, w, -oy))
+        self.screen.blit(self.stage, offset)
+
+    def add(self, rect):
+        if rect is not None:
+            self.drawn.append(rect)
+
+    def extend(self, rects):
+        self.drawn.extend(rects)
+
+    def present(self):
+        if self.output is not None:
+            self.output.present(None if self.full else self.restored + self.drawn)
+            self.full = False
+        elif self.full:
+            pygame.display.flip()
+            self.full = False
+        else:
+            pygame.display.update(self.restored + self.drawn)
+        self.last_drawn = self.drawn
@@ -0,0 +1,146 @@
+import os
+import zlib
+import struct
+import bisect
+import marshal
+from assets.src.config import TICK_RATE, REPLAY_SNAPSHOT_TICKS
+from assets.src.controls import ReplayInput, SIM_KEYS
+
+# Match recording + seekable playback.
+# A replay is the key events the sim consumed (tick they reached it, key,
+# up/down) plus a full GAME.Snapshot() every REPLAY_SNAPSHOT_TICKS as a seek
+# index. File layout (.bbr):
+#   header  "BBRP" version u8, tick rate u16, stress u32, ticks u32
+#   body    zlib( events_len u32, events, then per snapshot: tick u32, len u32, marshal(state) )
+# events: varint ticks since the previous event + one byte (key index << 1 | down),
+# ~2 bytes per key press/release, so a day of play is a few MB at most.
+
+MAGIC = b"BBRP"
+VERSION = 3  # 3: AnimState snapshots carry `entered`
+HEADER = struct.Struct("<4sBHII")
+U32 = struct.Struct("<I")
+
+# keys the sim doesn't read aren't recorded
+KEY_INDEX = {key: i for i, key in enumerate(SIM_KEYS)}
+
+
+def _write_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+class ReplayRecorder:
+    """
+    Collects one match: GAME feeds it through controls.recorder (events) and
+    GAME.Step (snapshots). save() writes the .bbr file.
+    """
+    def __init__(self, path, stress=0, snapshot_ticks=REPLAY_SNAPSHOT_TICKS):
+        self.path = path
+        self.stress = stress
+        self.snapshot_ticks = snapshot_ticks
+        self.events = bytearray()
+        self.last_tick = 0
+        self.snapshots = []   # (tick, marshal bytes)
+        self.ticks = 0        # match length, set by GAME.SaveReplay
+
+    def event(self, tick, key, down):
+        i = KEY_INDEX.get(key)
+        if i is None:
+            return
+        _write_varint(self.events, tick - self.last_tick)
+        self.events.append(i << 1 | down)
+        self.last_tick = tick
+
+    def snapshot(self, tick, state):
+        self.snapshots.append((tick, marshal.dumps(state)))
+
+    def save(self, path=None):
+        path = path or self.path
+        body = bytearray(U32.pack(len(self.events)))
+        body += self.events
+        for tick, blob in self.snapshots:
+            body += U32.pack(tick)
+            body += U32.pack(len(blob))
+            body += blob
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, TICK_RATE, self.stress, self.ticks))
+            f.write(zlib.compress(bytes(body), 9))
+        return path
+
+
+class Replay:
+    """
+    A loaded .bbr file.
+      events     [(tick, key, down), ...]
+      snapshots  [(tick, state), ...] in tick order
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, tick_rate, self.stress, self.ticks = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a replay (or a newer format)")
+        if tick_rate != TICK_RATE:
+            raise ValueError(f"{path}: recorded at {tick_rate} ticks/s, the sim runs at {TICK_RATE}")
+        body = zlib.decompress(data[HEADER.size:])
+
+        (events_len,) = U32.unpack_from(body)
+        pos, end = U32.size, U32.size + events_len
+        self.events = []
+        tick = 0
+        while pos < end:
+            delta, pos = _read_varint(body, pos)
+            tick += delta
+            code = body[pos]
+            pos += 1
+            self.events.append((tick, SIM_KEYS[code >> 1], bool(code & 1)))
+
+        self.snapshots = []
+        while pos < len(body):
+            tick, size = U32.unpack_from(body, pos)[0], U32.unpack_from(body, pos + 4)[0]
+            pos += 8
+            self.snapshots.append((tick, marshal.loads(body[pos:pos + size])))
+            pos += size
+        self.snapshot_ticks = [tick for tick, _ in self.snapshots]
+
+
+class ReplayPlayer:
+    """
+    Drives a GAME from a Replay. seek(tick) restores the closest snapshot at
+    or before tick and fast-forwards from there (no rendering), so a jump
+    costs at most REPLAY_SNAPSHOT_TICKS sim ticks.
+    """
+    def __init__(self, path, headless=True):
+        from assets.src.game import GAME  # game.py doesn't need to know about replays
+
+        self.replay = Replay(path)
+        self.game = GAME(headless=headless, controls=ReplayInput(self.replay.events),
+                         stress=self.replay.stress)
+
+    def seek(self, tick):
+        replay, game = self.replay, self.game
+        i = bisect.bisect_right(replay.snapshot_ticks, tick) - 1
+        if i < 0:
+            raise ValueError("replay has no snapshot at or before tick %d" % tick)
+        game.Restore(replay.snapshots[i][1])
+        while game.tick < tick:
+            game.Step()
+        game.particles.clear()  # bursts from the fast-forward
+        game.camera.center_on(game.player.rect.centerx)
+        game.renderer.invalidate()
@@ -0,0 +1,130 @@
+import os
+import json
+import pygame
+
+# Process-wide sprite cache.
+# Every frame is decoded + converted once, keyed by (path, scale, flip),
+# and the mirrored copy is built at the same time so draw() never has to
+# call pygame.transform.flip. Everyone gets the same shared Surfaces,
+# so never draw onto a surface that came out of here.
+
+_cache = {}     # (path, scale, flip) -> Surface
+_mirrors = {}   # Surface -> the same frame facing the other way
+_atlases = {}   # sprite_dir -> {name: subsurface}, or None if no atlas was built
+_masks = {}     # Surface -> pygame.Mask of its opaque pixels
+
+
+def load(path, scale=1, flip=False):
+    key = (path, scale, flip)
+    surf = _cache.get(key)
+    if surf is not None:
+        return surf
+
+    _store(path, scale, pygame.image.load(path).convert_alpha())
+    return _cache[key]
+
+
+def _store(key_path, scale, img):
+    if scale != 1:
+        img = pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
+    mirrored = pygame.transform.flip(img, True, False)
+
+    _cache[(key_path, scale, False)] = img
+    _cache[(key_path, scale, True)] = mirrored
+    _mirrors[img] = mirrored
+    _mirrors[mirrored] = img
+
+
+def load_atlas(sprite_dir):
+    """
+    Reads <sprite_dir>.atlas.png + .atlas.json (built by convert_sprites.py --pack)
+    in one go. Frames are subsurfaces of the atlas, so they share its pixels.
+    Returns {name: surface} or None when the atlas hasn't been built.
+    """
+    if sprite_dir in _atlases:
+        return _atlases[sprite_dir]
+
+    base = sprite_dir.rstrip("/\\")
+    if not os.path.exists(base + ".atlas.json"):
+        _atlases[sprite_dir] = None
+        return None
+
+    with open(base + ".atlas.json") as f:
+        index = json.load(f)
+    sheet = pygame.image.load(os.path.join(os.path.dirname(base), index["image"])).convert_alpha()
+
+    atlas = {}
+    for name, info in index["frames"].items():
+        atlas[name] = sheet.subsurface(info["rect"])
+    _atlases[sprite_dir] = atlas
+    return atlas
+
+
+def frame(sprite_dir, name, scale=1, flip=False):
+    # "walk/0" from the character's atlas if there is one, else sprite_dir/walk/0.png
+    key = (sprite_dir + "#" + name, scale, flip)
+    surf = _cache.get(key)
+    if surf is not None:
+        return surf
+
+    atlas = load_atlas(sprite_dir)
+    if atlas is None or name not in atlas:
+        surf = load(os.path.join(sprite_dir, name + ".png"), scale, flip)
+        _cache[key] = surf
+        return surf
+
+    _store(sprite_dir + "#" + name, scale, atlas[name])
+    return _cache[key]
+
+
+def frames(sprite_dir, names, scale=1, flip=False):
+    return [frame(sprite_dir, n, scale, flip) for n in names]
+
+
+def mirror(surf):
+    # pre-built mirror of a cached frame (no allocation)
+    return _mirrors[surf]
+
+
+def mask(surf):
+    # opaque-pixel mask of a cached frame, built once (pixel-accurate hits)
+    m = _masks.get(surf)
+    if m is None:
+        m = _masks[surf] = pygame.mask.from_surface(surf)
+    return m
+
+
+def forget(path):
+    """
+    Drops every cached Surface that came from `path` (a frame .png, or an
+    .atlas.png/.atlas.json) so the next load() / frame() reads it again.
+    Hot reload only; anyone still holding the old Surfaces keeps them.
+    """
+    path = os.path.normpath(path)
+    atlas_dir = None
+    if path.endswith((".atlas.png", ".atlas.json")):
+        atlas_dir = path.rsplit(".atlas.", 1)[0]
+    for key in list(_cache):
+        key_path = key[0]
+        if "#" in key_path:
+            sprite_dir, name = key_path.split("#", 1)
+            from_file = os.path.normpath(os.path.join(sprite_dir, name + ".png")) == path
+            from_atlas = atlas_dir is not None and os.path.normpath(sprite_dir) == atlas_dir
+            if not (from_file or from_atlas):
+                continue
+        elif os.path.normpath(key_path) != path:
+            continue
+        surf = _cache.pop(key)
+        _mirrors.pop(surf, None)
+        _masks.pop(surf, None)
+    if atlas_dir is not None:
+        for sprite_dir in list(_atlases):
+            if os.path.normpath(sprite_dir) == atlas_dir:
+                del _atlases[sprite_dir]
+
+
+def clear():
+    _cache.clear()
+    _mirrors.clear()
+    _atlases.clear()
+    _masks.clear()
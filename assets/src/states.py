@@ -0,0 +1,215 @@
+import json
+from assets.src import sprites
+
+# Table-driven animation / state engine.
+# A character is a JSON file (assets/data/*.json) listing its states:
+#   frames     sprite names (looked up in sprite_dir, atlas-aware)
+#   durations  ticks each frame is shown
+#   loop       wrap around at the end (else go to "next", or hold the last frame)
+#   next       state to enter once a non-looping state runs out
+#   cancel     states that input is allowed to switch to from this one
+#   speed      px per tick while in this state
+#   hitboxes   per frame: null or {"x", "w", "h" (, "y")} as fractions of the
+#              fighter's rect; x is the forward offset from the center
+# Everything is expanded into per-tick timelines at load time, so a running
+# fighter only does list indexing on its tick counter.
+
+
+class StateData:
+    __slots__ = ("name", "loop", "next", "cancel", "speed", "length",
+                 "frame_of", "images", "mirrored", "masks", "mirrored_masks", "hitboxes")
+
+    def __init__(self, name, spec, sprite_dir, scale):
+        self.name = name
+        self.loop = spec.get("loop", False)
+        self.next = spec.get("next")
+        self.cancel = frozenset(spec.get("cancel", ()))
+        self.speed = spec.get("speed", 0)
+
+        frames = sprites.frames(sprite_dir, spec["frames"], scale)
+        durations = spec["durations"]
+        hitboxes = spec.get("hitboxes") or [None] * len(frames)
+        if not (len(frames) == len(durations) == len(hitboxes)):
+            raise ValueError(f"state {name!r}: frames, durations and hitboxes must line up")
+
+        # per-tick timelines
+        self.frame_of = []
+        self.hitboxes = []
+        for i, ticks in enumerate(durations):
+            hb = hitboxes[i]
+            if hb is not None:
+                hb = (hb["x"], hb.get("y", 0.0), hb["w"], hb["h"])
+            self.frame_of.extend([i] * ticks)
+            self.hitboxes.extend([hb] * ticks)
+        self.length = len(self.frame_of)
+        self.images = [frames[i] for i in self.frame_of]
+        self.mirrored = [sprites.mirror(img) for img in self.images]
+        self.masks = [sprites.mask(img) for img in self.images]
+        self.mirrored_masks = [sprites.mask(img) for img in self.mirrored]
+
+
+class CharacterData:
+    """
+    One character's states, loaded from its data file (see load_character).
+    spec: the file's contents already loaded (tuning sweeps pass patched copies).
+    """
+    def __init__(self, path, sprite_dir=None, scale=1, spec=None):
+        if spec is None:
+            with open(path) as f:
+                spec = json.load(f)
+        self.path = path
+        self.sprite_dir = sprite_dir or spec["sprite_dir"]
+        self.start = spec.get("start", "idle")
+        self.states = {name: StateData(name, s, self.sprite_dir, scale)
+                       for name, s in spec["states"].items()}
+
+        for state in self.states.values():
+            for target in state.cancel | ({state.next} if state.next else set()):
+                if target not in self.states:
+                    raise ValueError(f"{path}: state {state.name!r} points at unknown state {target!r}")
+
+
+_characters = {}  # (path, sprite_dir, scale) -> CharacterData
+
+
+def load_character(path, sprite_dir=None, scale=1):
+    key = (path, sprite_dir, scale)
+    data = _characters.get(key)
+    if data is None:
+        data = _characters[key] = CharacterData(path, sprite_dir, scale)
+    return data
+
+
+def reload_characters(affected):
+    """
+    Rebuilds every cached CharacterData for which affected(data) is true
+    (hot reload). Returns {old data: new data}; a character whose new data
+    doesn't load stays as it was.
+    """
+    swapped = {}
+    for key, data in list(_characters.items()):
+        if not affected(data):
+            continue
+        path, sprite_dir, scale = key
+        try:
+            new = CharacterData(path, sprite_dir, scale)
+        except (OSError, ValueError, KeyError, RuntimeError) as e:  # pygame.error is a RuntimeError
+            print(f"reload {path} failed: {e}")
+            continue
+        _characters[key] = new
+        swapped[data] = new
+    return swapped
+
+
+class AnimState:
+    """
+    Where one fighter is in its character's state table.
+    Driven by step() once per sim tick; all lookups are O(1) on the tick.
+    A state entered with set() shows its tick 0 on the next step(), the same
+    as one entered through "next", so every state runs its full durations.
+    """
+    __slots__ = ("data", "state", "tick", "frame", "frame_changed", "done", "entered")
+
+    def __init__(self, data):
+        self.data = data
+        self.state = data.states[data.start]
+        self.tick = 0
+        self.frame = 0
+        self.frame_changed = False
+        self.done = False
+        self.entered = True   # set() and step() not run yet: step() holds tick 0
+
+    @property
+    def name(self):
+        return self.state.name
+
+    def set(self, name):
+        # enter a state from tick 0 (no-op if we're already in it)
+        if name == self.state.name:
+            return
+        self.state = self.data.states[name]
+        self.tick = 0
+        self.frame = 0
+        self.frame_changed = True
+        self.done = False
+        self.entered = True
+
+    # --- save/restore (replays) ---
+    def snapshot(self):
+        return (self.state.name, self.tick, self.frame, self.frame_changed, self.done, self.entered)
+
+    def restore(self, snap):
+        name, self.tick, self.frame, self.frame_changed, self.done, self.entered = snap
+        self.state = self.data.states[name]
+
+    def rebind(self, data):
+        # switch to reloaded data, staying in the same state as far as it still exists
+        self.data = data
+        self.state = data.states.get(self.state.name) or data.states[data.start]
+        self.tick = min(self.tick, self.state.length - 1)
+        self.frame = self.state.frame_of[self.tick]
+        self.done = False
+
+    def can_enter(self, name):
+        return name == self.state.name or name in self.state.cancel
+
+    def step(self):
+        if self.entered:
+            # first tick since set(): that's tick 0, don't skip it. Entering
+            # isn't a frame change (the walk step gate counts those)
+            self.entered = False
+            self.frame_changed = False
+            return
+        state = self.state
+        self.tick += 1
+        if self.tick >= state.length:
+            if state.loop:
+                self.tick = 0
+            elif state.next:
+                self.set(state.next)
+                self.entered = False  # this tick is its tick 0
+                return
+            else:
+                self.tick = state.length - 1
+                self.done = True
+        frame = state.frame_of[self.tick]
+        self.frame_changed = frame != self.frame
+        self.frame = frame
+
+    def finish(self):
+        # cut a non-looping state short (go to its "next" now)
+        if self.state.next:
+            self.set(self.state.next)
+        else:
+            self.tick = self.state.length - 1
+            self.done = True
+
+    def image(self, mirrored=False):
+        if mirrored:
+            return self.state.mirrored[self.tick]
+        return self.state.images[self.tick]
+
+    def mask(self, mirrored=False):
+        # opaque pixels of image(mirrored), for pixel-accurate hits
+        if mirrored:
+            return self.state.mirrored_masks[self.tick]
+        return self.state.masks[self.tick]
+
+    def hitbox(self, rect, facing_right, out):
+        """
+        Writes this tick's hitbox (if the frame has one) into out; returns
+        True if there is one.
+        """
+        hb = self.state.hitboxes[self.tick]
+        if hb is None:
+            return False
+        fx, fy, fw, fh = hb
+        w = int(rect.width * fw)
+        h = int(rect.height * fh)
+        y = rect.centery + int(rect.height * fy) - h // 2
+        if facing_right:
+            x = rect.centerx + int(rect.width * fx)
+        else:
+            x = rect.centerx - int(rect.width * fx) - w
+        out.update(x, y, w, h)
+        return True
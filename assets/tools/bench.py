@@ -0,0 +1,187 @@
+"""
+Performance benchmarks + regression gate.
+
+    python -m assets.tools.bench                      # run, print, write bench_results.json
+    python -m assets.tools.bench --save-baseline      # ...and make that the new baseline
+    python -m assets.tools.bench --threshold 0.15     # fail if anything is >15% slower than baseline
+
+Runs headless (SDL dummy drivers), so numbers are CPU cost, not vsync.
+Timings are milliseconds, allocation counts are per sim tick; lower is better.
+"""
+import gc
+import os
+import sys
+import json
+import time
+import tracemalloc
+import argparse
+import tempfile
+import statistics
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+BASELINE = "assets/tools/bench_baseline.json"
+RESULTS = "bench_results.json"
+
+
+def unit(name):
+    return "" if name.startswith("tick_") else "ms"
+
+
+def per_call_ms(fn, n, rounds=5):
+    # median over rounds of the mean cost of one call
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        samples.append((time.perf_counter() - start) * 1000 / n)
+    return statistics.median(samples)
+
+
+def bench_startup():
+    from assets.src import sprites
+    from assets.src.game import GAME
+
+    sprites.clear()  # cold: nothing decoded yet
+    start = time.perf_counter()
+    game = GAME(headless=True)
+    game.DisplayHandler()
+    pygame.display.flip()
+    return (time.perf_counter() - start) * 1000, game
+
+
+def bench_game(game, results):
+    results["update_tick"] = per_call_ms(game.UpdateHandler, 2000)
+    results["display_tick"] = per_call_ms(game.DisplayHandler, 300)
+
+    player, screen = game.player, game.screen
+    player.flip = False
+    results["player_draw"] = per_call_ms(lambda: player.draw(screen), 5000)
+    player.flip = True
+    results["player_draw_flip"] = per_call_ms(lambda: player.draw(screen), 5000)
+
+
+def bench_allocations(game, results, ticks=1000):
+    """
+    Steady-state sim ticks should allocate (almost) nothing:
+      tick_gc_allocs   - net GC-tracked objects per tick (what advances the gen0
+                         counter, i.e. what eventually triggers a collection pause)
+      tick_alloc_bytes - bytes still held after the run, per tick (leaks / growing caches)
+      tick_peak_bytes  - transient high-water mark above the starting heap
+    """
+    game.Run(300)  # warm up: every animation/bump path has run once
+
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before_mem = tracemalloc.get_traced_memory()[0]
+    before_gc = gc.get_count()[0]
+    game.Run(ticks)
+    after_gc = gc.get_count()[0]
+    after_mem, peak_mem = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+
+    results["tick_gc_allocs"] = max(0, after_gc - before_gc) / ticks
+    results["tick_alloc_bytes"] = max(0, after_mem - before_mem) / ticks
+    results["tick_peak_bytes"] = max(0, peak_mem - before_mem)
+
+
+def bench_bigboy(results):
+    from assets.src.entities import BigBoy
+    from assets.src.controls import ScriptedInput
+    from assets.src.config import TICK_DT
+
+    bigboy = BigBoy(sprite_dir="assets/sprites", pos=(220, 420), ground_y=420)
+    controls = ScriptedInput([{pygame.K_LEFT}], loop=True)
+    arena = pygame.Rect(60, 0, 680, 600)
+
+    def tick():
+        bigboy.update(TICK_DT, controls, arena_rect=arena)
+        controls.advance()
+    results["bigboy_update"] = per_call_ms(tick, 5000)
+
+
+def bench_process_image(results):
+    from assets.tools import convert_sprites
+
+    # synthetic 4K capture: bright projector wall with a dark figure in the middle
+    img = pygame.Surface((3840, 2160))
+    img.fill((235, 235, 230))
+    pygame.draw.ellipse(img, (20, 20, 25), (1500, 300, 900, 1700))
+    pygame.draw.rect(img, (180, 60, 60), (1700, 900, 500, 300))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic_4k.png")
+        pygame.image.save(img, path)
+        results["process_image_4k"] = per_call_ms(lambda: convert_sprites.process_image(path), 1, rounds=3)
+
+
+def run():
+    results = {}
+    results["startup"], game = bench_startup()
+    bench_game(game, results)
+    bench_allocations(game, results)
+    bench_bigboy(results)
+    bench_process_image(results)
+    return results
+
+
+def compare(results, baseline, threshold):
+    # -> list of (metric, baseline, now) that got worse than allowed
+    regressions = []
+    for name, base in baseline.items():
+        now = results.get(name)
+        if now is not None and base > 0 and now > base * (1 + threshold):
+            regressions.append((name, base, now))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=RESULTS, help="where to write this run's results")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="allowed slowdown vs baseline as a fraction (0.20 = 20%%)")
+    parser.add_argument("--max-tick-allocs", type=float, default=0.1,
+                        help="fail if a steady-state tick creates more GC-tracked objects than this")
+    args = parser.parse_args()
+
+    results = run()
+    for name, value in results.items():
+        print(f"{name:<20} {value:10.4f} {unit(name)}")
+
+    if results["tick_gc_allocs"] > args.max_tick_allocs:
+        print(f"ALLOCATING: {results['tick_gc_allocs']:.3f} GC objects per tick (max {args.max_tick_allocs})")
+        return 1
+
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print("baseline saved to", args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline at", args.baseline, "(run with --save-baseline)")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, base, now in regressions:
+        print(f"REGRESSION {name}: {base:.4f} -> {now:.4f} {unit(name)} (+{(now / base - 1) * 100:.0f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
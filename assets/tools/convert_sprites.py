@@ -1,95 +1,346 @@
-import os
-import pygame
-
-pygame.init()
-pygame.display.set_mode((1, 1))  # <-- REQUIRED for convert()/convert_alpha()
-
-
-RAW_DIR = "assets/raw"
-OUT_DIR = "assets/processed"
-TARGET_HEIGHT = 128
-PAD = 14
-WHITE = (255, 255, 255)
-
-os.makedirs(OUT_DIR, exist_ok=True)
-
-def autocrop(surface, pad=0):
-    mask = pygame.mask.from_surface(surface)
-    rects = mask.get_bounding_rects()
-    if not rects:
-        return surface
-
-    r = rects[0].copy()
-    for rr in rects[1:]:
-        r.union_ip(rr)
-
-    # apply padding
-    r.x -= pad
-    r.y -= pad
-    r.w += pad * 2
-    r.h += pad * 2
-
-    # hard clip to surface bounds (safe for subsurface)
-    bounds = surface.get_rect()
-    x0 = max(bounds.left, r.left)
-    y0 = max(bounds.top,  r.top)
-    x1 = min(bounds.right, r.right)
-    y1 = min(bounds.bottom, r.bottom)
-
-    # if something went weird, just return original
-    if x1 <= x0 or y1 <= y0:
-        return surface
-
-    return surface.subsurface((x0, y0, x1 - x0, y1 - y0)).copy()
-
-def process_image(path):
-    surf = pygame.image.load(path).convert_alpha()
-    w, h = surf.get_size()
-    px = pygame.PixelArray(surf)
-
-    # tuned for projector screen + black outfit
-    BRIGHT = 150      # lower = more aggressive background kill
-    CHROMA = 45       # allows slight tint variation
-    HARD_ALPHA = 180  # cutoff to eliminate halos
-
-    for y in range(h):
-        for x in range(w):
-            r, g, b, a = surf.unmap_rgb(px[x, y])
-
-            vmax = max(r, g, b)
-            vmin = min(r, g, b)
-            chroma = vmax - vmin
-
-            if vmax >= BRIGHT and chroma <= CHROMA:
-                # background → fully transparent
-                px[x, y] = (r, g, b, 0)
-            else:
-                # force solid alpha (kills glow/halo)
-                px[x, y] = (r, g, b, 255)
-
-    del px  # unlock surface
-
-    # --- crop using alpha ---
-    surf = autocrop(surf, PAD)
-
-    # --- scale (pixel art friendly) ---
-    scale = TARGET_HEIGHT / surf.get_height()
-    new_w = max(1, int(round(surf.get_width() * scale)))
-    surf = pygame.transform.scale(surf, (new_w, TARGET_HEIGHT))
-
-    return surf
-
-for name in sorted(os.listdir(RAW_DIR)):
-    if not name.lower().endswith((".png", ".jpg", ".jpeg")):
-        continue
-
-    src = os.path.join(RAW_DIR, name)
-    out = process_image(src)
-
-    out_name = os.path.splitext(name)[0] + ".png"
-    out_path = os.path.join(OUT_DIR, out_name)
-
-    pygame.image.save(out, out_path)
-    print("saved", out_path)
-
-pygame.quit()
+"""
+Sprite build: key the projector background out of raw photos, crop, scale.
+
+    python -m assets.tools.convert_sprites                  # rebuild what changed
+    python -m assets.tools.convert_sprites --height 160     # settings change -> everything rebuilds
+    python -m assets.tools.convert_sprites --force --atlas bigboy
+    python -m assets.tools.convert_sprites --pack assets/sprites/bigboy
+
+Incremental: <out>/.manifest.json remembers each source's content hash (and
+size/mtime, so unchanged files aren't even read) plus the settings it was
+built with. Only new/changed sources are reprocessed, and outputs whose
+source was deleted are removed.
+"""
+import os
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # no numpy -> scalar keying only
+    np = None
+
+
+# defaults, all overridable on the command line
+RAW_DIR = "assets/raw"
+OUT_DIR = "assets/processed"
+TARGET_HEIGHT = 128
+PAD = 14
+MANIFEST = ".manifest.json"
+# bump when the processing itself changes, so old outputs get rebuilt
+BUILD_VERSION = 1
+WHITE = (255, 255, 255)
+
+# tuned for projector screen + black outfit
+BRIGHT = 150      # lower = more aggressive background kill
+CHROMA = 45       # allows slight tint variation
+HARD_ALPHA = 180  # cutoff to eliminate halos
+
+
+def init_display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # <-- REQUIRED for convert()/convert_alpha()
+
+
+def autocrop(surface, pad=0):
+    mask = pygame.mask.from_surface(surface)
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return surface
+
+    r = rects[0].copy()
+    for rr in rects[1:]:
+        r.union_ip(rr)
+
+    # apply padding
+    r.x -= pad
+    r.y -= pad
+    r.w += pad * 2
+    r.h += pad * 2
+
+    # hard clip to surface bounds (safe for subsurface)
+    bounds = surface.get_rect()
+    x0 = max(bounds.left, r.left)
+    y0 = max(bounds.top,  r.top)
+    x1 = min(bounds.right, r.right)
+    y1 = min(bounds.bottom, r.bottom)
+
+    # if something went weird, just return original
+    if x1 <= x0 or y1 <= y0:
+        return surface
+
+    return surface.subsurface((x0, y0, x1 - x0, y1 - y0)).copy()
+
+
+def key_background_scalar(surf, bright=BRIGHT, chroma_max=CHROMA):
+    # original per-pixel path, kept so outputs can be diffed against key_background_numpy
+    w, h = surf.get_size()
+    px = pygame.PixelArray(surf)
+
+    for y in range(h):
+        for x in range(w):
+            r, g, b, a = surf.unmap_rgb(px[x, y])
+
+            vmax = max(r, g, b)
+            vmin = min(r, g, b)
+            chroma = vmax - vmin
+
+            if vmax >= bright and chroma <= chroma_max:
+                # background → fully transparent
+                px[x, y] = (r, g, b, 0)
+            else:
+                # force solid alpha (kills glow/halo)
+                px[x, y] = (r, g, b, 255)
+
+    del px  # unlock surface
+
+
+def key_background_numpy(surf, bright=BRIGHT, chroma_max=CHROMA):
+    # same rules as key_background_scalar, done on the whole pixel array at once
+    rgb = pygame.surfarray.pixels3d(surf)
+    vmax = rgb.max(axis=2)
+    vmin = rgb.min(axis=2)
+    background = (vmax >= bright) & ((vmax - vmin) <= chroma_max)
+    del rgb  # unlock surface
+
+    alpha = pygame.surfarray.pixels_alpha(surf)
+    alpha[...] = np.where(background, 0, 255)
+    del alpha  # unlock surface
+
+
+def process_image(path, scalar=False, height=TARGET_HEIGHT, pad=PAD, bright=BRIGHT, chroma=CHROMA):
+    surf = pygame.image.load(path).convert_alpha()
+
+    if scalar or np is None:
+        key_background_scalar(surf, bright, chroma)
+    else:
+        key_background_numpy(surf, bright, chroma)
+
+    # --- crop using alpha ---
+    surf = autocrop(surf, pad)
+
+    # --- scale (pixel art friendly) ---
+    scale = height / surf.get_height()
+    new_w = max(1, int(round(surf.get_width() * scale)))
+    surf = pygame.transform.scale(surf, (new_w, height))
+
+    return surf
+
+
+def out_name(name):
+    return os.path.splitext(name)[0] + ".png"
+
+
+def convert_file(name, settings):
+    # settings: see build_settings()
+    src = os.path.join(settings["raw"], name)
+    out = process_image(src, settings["scalar"], settings["height"], settings["pad"],
+                        settings["bright"], settings["chroma"])
+
+    out_path = os.path.join(settings["out"], out_name(name))
+    pygame.image.save(out, out_path)
+    return out_path
+
+
+# --- incremental build ---
+def build_settings(args):
+    # everything that changes the output pixels (a change rebuilds every frame)
+    return {"raw": args.raw, "out": args.out, "height": args.height, "pad": args.pad,
+            "bright": args.bright, "chroma": args.chroma, "scalar": args.scalar,
+            "version": BUILD_VERSION}
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"settings": None, "files": {}}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def plan(names, settings, manifest, force=False):
+    """
+    -> (names to rebuild, {name: manifest entry} for every current source).
+    A source is rebuilt when it's new, its content hash changed, its output
+    is gone, or the settings changed. size + mtime match -> hash isn't re-read.
+    """
+    old = manifest["files"]
+    same_settings = manifest["settings"] == {k: v for k, v in settings.items() if k != "out"} and not force
+    todo = []
+    entries = {}
+    for name in names:
+        st = os.stat(os.path.join(settings["raw"], name))
+        prev = old.get(name)
+        if prev is not None and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns:
+            digest = prev["hash"]
+        else:
+            digest = file_hash(os.path.join(settings["raw"], name))
+        entries[name] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "out": out_name(name)}
+        if (not same_settings or prev is None or prev["hash"] != digest
+                or not os.path.exists(os.path.join(settings["out"], out_name(name)))):
+            todo.append(name)
+    return todo, entries
+
+
+def prune(out_dir, manifest, entries):
+    # outputs we built from sources that are gone; never touches files we didn't make
+    removed = []
+    for name, prev in manifest["files"].items():
+        if name in entries:
+            continue
+        path = os.path.join(out_dir, prev["out"])
+        if os.path.exists(path):
+            os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def pack_atlas(frames, max_width=1024, spacing=1):
+    """
+    Shelf-pack (name, surface) pairs into one atlas surface.
+    Returns (atlas, index) where index maps name -> {"rect": [x, y, w, h]}.
+    """
+    order = sorted(frames, key=lambda f: f[1].get_height(), reverse=True)
+    max_width = max([max_width] + [s.get_width() for _, s in order])
+
+    placed = []
+    x = y = shelf_h = 0
+    for name, surf in order:
+        w, h = surf.get_size()
+        if x + w > max_width:
+            # next shelf
+            x = 0
+            y += shelf_h + spacing
+            shelf_h = 0
+        placed.append((name, surf, x, y))
+        x += w + spacing
+        shelf_h = max(shelf_h, h)
+
+    atlas_w = max([x + s.get_width() for _, s, x, _ in placed] or [1])
+    atlas_h = max([y + s.get_height() for _, s, _, y in placed] or [1])
+    atlas = pygame.Surface((atlas_w, atlas_h), pygame.SRCALPHA)
+
+    index = {}
+    for name, surf, x, y in placed:
+        atlas.blit(surf, (x, y))
+        index[name] = {"rect": [x, y, surf.get_width(), surf.get_height()]}
+    return atlas, index
+
+
+def frame_names(frame_dir):
+    # every png under frame_dir, named by relative path without extension ("walk/0")
+    names = []
+    for root, _, files in os.walk(frame_dir):
+        for f in files:
+            if f.lower().endswith(".png"):
+                rel = os.path.relpath(os.path.join(root, f), frame_dir)
+                names.append(os.path.splitext(rel)[0].replace(os.sep, "/"))
+    return sorted(names)
+
+
+def write_atlas(frames, out_base):
+    """
+    Writes <out_base>.atlas.png + <out_base>.atlas.json (see sprites.load_atlas).
+    """
+    atlas, index = pack_atlas(frames)
+    pygame.image.save(atlas, out_base + ".atlas.png")
+    with open(out_base + ".atlas.json", "w") as f:
+        json.dump({"image": os.path.basename(out_base) + ".atlas.png", "frames": index}, f, separators=(",", ":"))
+    return out_base + ".atlas.png"
+
+
+def pack_dir(frame_dir, out_base=None):
+    # pack an already-processed frame folder (e.g. assets/sprites/bigboy)
+    frames = [(n, pygame.image.load(os.path.join(frame_dir, n + ".png"))) for n in frame_names(frame_dir)]
+    return write_atlas(frames, out_base or frame_dir.rstrip("/\\"))
+
+
+def raw_names(raw_dir=RAW_DIR):
+    return [name for name in sorted(os.listdir(raw_dir))
+            if name.lower().endswith((".png", ".jpg", ".jpeg"))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--raw", default=RAW_DIR, help="folder of raw photos (default %(default)s)")
+    parser.add_argument("--out", default=OUT_DIR, help="where the processed frames go (default %(default)s)")
+    parser.add_argument("--height", type=int, default=TARGET_HEIGHT, help="output frame height in px")
+    parser.add_argument("--pad", type=int, default=PAD, help="px kept around the figure when cropping")
+    parser.add_argument("--bright", type=int, default=BRIGHT,
+                        help="background brightness threshold (lower = more aggressive)")
+    parser.add_argument("--chroma", type=int, default=CHROMA, help="allowed background tint")
+    parser.add_argument("--scalar", action="store_true",
+                        help="use the slow per-pixel keying path (for checking outputs)")
+    parser.add_argument("--force", action="store_true", help="rebuild everything, ignore the manifest")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="keep outputs whose source photo was deleted")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 = convert in this process)")
+    parser.add_argument("--atlas", metavar="NAME",
+                        help="also pack the outputs into OUT/NAME.atlas.png + .json")
+    parser.add_argument("--pack", metavar="DIR",
+                        help="skip keying, just pack an existing frame folder into DIR.atlas.png + .json")
+    args = parser.parse_args()
+
+    if args.pack:
+        init_display()
+        print("saved", pack_dir(args.pack))
+        return
+
+    os.makedirs(args.out, exist_ok=True)
+    settings = build_settings(args)
+    manifest = load_manifest(args.out)
+    names = raw_names(args.raw)
+    todo, entries = plan(names, settings, manifest, args.force)
+
+    if len(todo) <= 1 or args.jobs <= 1:
+        # a pool takes longer to start than one frame takes to convert
+        init_display()
+        for name in todo:
+            print("saved", convert_file(name, settings))
+    else:
+        # each worker needs its own display for convert_alpha()
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_display) as pool:
+            for out_path in pool.map(convert_file, todo, [settings] * len(todo)):
+                print("saved", out_path)
+        init_display()
+
+    removed = [] if args.no_prune else prune(args.out, manifest, entries)
+    for path in removed:
+        print("removed", path)
+    if args.no_prune:
+        # keep tracking them, so a later run can still prune
+        entries = dict(manifest["files"], **entries)
+
+    save_manifest(args.out, {"settings": {k: v for k, v in settings.items() if k != "out"}, "files": entries})
+    print(f"{len(todo)} rebuilt, {len(names) - len(todo)} up to date, {len(removed)} removed")
+
+    atlas_base = os.path.join(args.out, args.atlas) if args.atlas else None
+    if atlas_base and (todo or removed or not os.path.exists(atlas_base + ".atlas.png")):
+        frames = [(os.path.splitext(n)[0], pygame.image.load(os.path.join(args.out, out_name(n))))
+                  for n in names]
+        print("saved", write_atlas(frames, atlas_base))
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
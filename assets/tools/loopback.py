@@ -0,0 +1,160 @@
+"""
+Rollback netplay soak over a local loopback socket.
+
+    python -m assets.tools.loopback                       # 3000 ticks, 4 frames of lag, 10% loss
+    python -m assets.tools.loopback --lag 6 --loss 0.3
+
+Runs both cabinets in one process (headless, scripted input on each side),
+talking over two UDP sockets on 127.0.0.1 with artificial lag/loss. At the
+end both sims must be in exactly the same state; exits 1 on a desync.
+Then a second match where player 1 gets nothing from player 2 for --hold
+frames at a time and then everything at once (the peer ran ahead and a
+pile of its packets lands in one Poll), same check.
+Also prints what a snapshot/restore costs.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from assets.src.game import GAME
+from assets.src.controls import ScriptedInput, soak_script
+from assets.src.netplay import RollbackSession, UdpTransport
+
+
+class LaggyTransport:
+    """
+    Holds received packets back for `lag` frames and drops `loss` of them.
+    """
+    def __init__(self, transport, lag, loss, rng):
+        self.transport = transport
+        self.lag = lag
+        self.loss = loss
+        self.rng = rng
+        self.frame = 0
+        self.queue = []   # (deliver at frame, data)
+
+    def send(self, data):
+        self.transport.send(data)
+
+    def receive(self):
+        self.frame += 1
+        for data in self.transport.receive():
+            if self.rng.random() >= self.loss:
+                self.queue.append((self.frame + self.lag, data))
+        ready = [data for at, data in self.queue if at <= self.frame]
+        self.queue = [(at, data) for at, data in self.queue if at > self.frame]
+        return ready
+
+
+class HeldTransport:
+    """
+    Every `period` frames, holds everything received for `hold` frames,
+    then hands it all over in one receive().
+    """
+    def __init__(self, transport, hold, period):
+        self.transport = transport
+        self.hold = hold
+        self.period = period
+        self.frame = 0
+        self.held = []
+
+    def send(self, data):
+        self.transport.send(data)
+
+    def receive(self):
+        self.frame += 1
+        self.held.extend(self.transport.receive())
+        if self.frame % self.period < self.hold:
+            return []
+        ready, self.held = self.held, []
+        return ready
+
+
+def p2_script():
+    # BigBoy walks in, bumps, walks off; a different rhythm from player 1
+    left, right, space = pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE
+    return ScriptedInput.from_segments([
+        (33, {left}),
+        (2, {left, space}),
+        (25, set()),
+        (30, {right}),
+        (12, set()),
+    ], loop=True)
+
+
+def time_snapshots(game, n=2000):
+    start = time.perf_counter()
+    for _ in range(n):
+        snap = game.Snapshot()
+    mid = time.perf_counter()
+    for _ in range(n):
+        game.Restore(snap)
+    end = time.perf_counter()
+    return (mid - start) * 1e6 / n, (end - mid) * 1e6 / n
+
+
+def play(ticks, transport_a, transport_b):
+    # one match; True if both sims end up identical
+    a = RollbackSession.attach(GAME, soak_script(), transport_a, side=0, headless=True)
+    b = RollbackSession.attach(GAME, p2_script(), transport_b, side=1, headless=True)
+
+    start = time.perf_counter()
+    while a.tick < ticks or b.tick < ticks:
+        for s in (a, b):
+            if s.tick < ticks:
+                s.Frame()
+            else:
+                s.Poll()
+                s._send()
+    # let the last inputs arrive (and any rollbacks they cause happen)
+    while a.confirmed < ticks - 1 or b.confirmed < ticks - 1:
+        for s in (a, b):
+            s.Poll()
+            s._send()
+    took = time.perf_counter() - start
+
+    for name, s in (("p1", a), ("p2", b)):
+        print(f"{name}: {s.rollbacks} rollbacks, {s.resimulated} ticks re-run, {s.stalls} stalls")
+    snap_us, restore_us = time_snapshots(a.game)
+    print(f"snapshot {snap_us:.1f} us, restore {restore_us:.1f} us, {ticks} ticks in {took:.2f}s")
+
+    if a.game.Snapshot() != b.game.Snapshot():
+        print("DESYNC: the two sims disagree")
+        return False
+    print("in sync")
+    return True
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--lag", type=int, default=4, help="frames before a packet is delivered")
+    parser.add_argument("--loss", type=float, default=0.1, help="fraction of packets dropped")
+    parser.add_argument("--hold", type=int, default=12, help="frames p1's packets are held in the burst match")
+    parser.add_argument("--ports", type=int, nargs=2, default=(47001, 47002),
+                        help="the burst match uses these + 2")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pa, pb = args.ports
+    print(f"--- lag {args.lag}, loss {args.loss}")
+    ok = play(args.ticks,
+              LaggyTransport(UdpTransport(pa, ("127.0.0.1", pb)), args.lag, args.loss, rng),
+              LaggyTransport(UdpTransport(pb, ("127.0.0.1", pa)), args.lag, args.loss, rng))
+    print(f"--- p1 receives in bursts every {args.hold} frames")
+    ok &= play(args.ticks,
+               HeldTransport(UdpTransport(pa + 2, ("127.0.0.1", pb + 2)), args.hold, args.hold * 3),
+               UdpTransport(pb + 2, ("127.0.0.1", pa + 2)))
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+Tuning sweeps: scripted headless matches over a grid of constants.
+
+    python -m assets.tools.sweep                                        # default grid
+    python -m assets.tools.sweep --grid hit_w=0.2,0.25,0.3 launch_vx=14,18,22 -j 8
+    python -m assets.tools.sweep --character bigboy --grid bump_ticks=4,6,8 --out sweep.csv
+
+Every combination of the --grid values is played against the training dummy
+from a range of approach distances (walk in for N ticks, bump, let it land),
+each match starting from a restore of the same snapshot. One row per
+combination:
+  hit%       matches where the bump launched the dummy
+  knockback  mean px the dummy ended up from where it stood (hits only)
+  wall%      hits that carried the dummy into an arena wall
+  to_wall    mean ticks from the hit to the wall (the ones that got there)
+"""
+import io
+import os
+import csv
+import copy
+import json
+import argparse
+import itertools
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+from assets.src.game import GAME
+from assets.src.classes import DUMMY
+from assets.src.controls import SIM_KEYS, TickInput
+from assets.src.states import AnimState, CharacterData
+
+PARAMS = {
+    "hit_x": "bump hitbox forward offset (fraction of the fighter's width)",
+    "hit_w": "bump hitbox width (fraction of the fighter's width)",
+    "hit_h": "bump hitbox height (fraction of the fighter's height)",
+    "pre_ticks": "pre_bump wind-up length (ticks per frame)",
+    "bump_ticks": "bump active length (ticks per frame)",
+    "launch_vx": "DUMMY launch speed away from the attacker (px/tick)",
+    "launch_vy": "DUMMY launch speed upwards (px/tick, negative = up)",
+}
+DEFAULT_GRID = {"hit_w": [0.2, 0.25, 0.3], "launch_vx": [14, 18, 22]}
+METRICS = ("matches", "hit%", "knockback", "wall%", "to_wall")
+
+CHARACTERS = {
+    # name -> (data file, sprite_dir override, key that walks toward the dummy)
+    "player": ("assets/data/player.json", None, pygame.K_RIGHT),
+    "bigboy": ("assets/data/bigboy.json", "assets/sprites", pygame.K_LEFT),
+}
+LAUNCH_DEFAULTS = (DUMMY.LAUNCH_VX, DUMMY.LAUNCH_VY)
+
+
+def bit(key):
+    return 1 << SIM_KEYS.index(key)
+
+
+def patch_spec(spec, params):
+    # copy of a character's data file with the swept values put in
+    spec = copy.deepcopy(spec)
+    states = spec["states"]
+    for name in ("hit_x", "hit_w", "hit_h"):
+        if name in params:
+            for hb in states["bump"].get("hitboxes", ()):
+                if hb is not None:
+                    hb[name[4:]] = params[name]
+    for name, state in (("pre_ticks", "pre_bump"), ("bump_ticks", "bump")):
+        if name in params:
+            durations = states[state]["durations"]
+            states[state]["durations"] = [int(params[name])] * len(durations)
+    return spec
+
+
+# --- worker side (one GAME per process, reused for every match) ---
+_worker = {}
+
+
+def init_worker(character):
+    with contextlib.redirect_stdout(io.StringIO()):  # no startup log per worker
+        if character == "bigboy":
+            game = GAME(headless=True, controls=TickInput(), p2_controls=TickInput())
+        else:
+            game = GAME(headless=True, controls=TickInput())
+    path, sprite_dir, toward = CHARACTERS[character]
+    with open(path) as f:
+        spec = json.load(f)
+    _worker.update(game=game, start=game.Snapshot(), character=character,
+                   path=path, sprite_dir=sprite_dir, spec=spec, toward=bit(toward))
+
+
+def play(approach, settle):
+    # -> (tick of the hit or None, tick the dummy reached a wall or None, knockback px)
+    game = _worker["game"]
+    game.Restore(_worker["start"])
+    inputs = game.p2_controls if _worker["character"] == "bigboy" else game.controls
+    toward, space = _worker["toward"], bit(pygame.K_SPACE)
+    enemy, arena = game.enemy, game.arena
+    x0 = enemy.rect.centerx
+
+    hit_tick = wall_tick = None
+    for t in range(approach + 1 + settle):
+        if t < approach:
+            inputs.feed(toward)
+        elif t == approach:
+            inputs.feed(toward | space)
+        else:
+            inputs.feed(0)
+        game.Step()
+        if hit_tick is None:
+            if enemy.stun_ms > 0:
+                hit_tick = t
+        elif wall_tick is None and (enemy.rect.left <= arena.left or enemy.rect.right >= arena.right):
+            wall_tick = t
+    return hit_tick, wall_tick, abs(enemy.rect.centerx - x0)
+
+
+def run_combo(params, approaches, settle):
+    game = _worker["game"]
+    data = CharacterData(_worker["path"], _worker["sprite_dir"], spec=patch_spec(_worker["spec"], params))
+    fighter = game.bigboy if _worker["character"] == "bigboy" else game.player
+    fighter.anim = AnimState(data)
+    DUMMY.LAUNCH_VX = params.get("launch_vx", LAUNCH_DEFAULTS[0])
+    DUMMY.LAUNCH_VY = params.get("launch_vy", LAUNCH_DEFAULTS[1])
+
+    hits = walls = 0
+    knockback = to_wall = 0
+    for approach in approaches:
+        hit_tick, wall_tick, moved = play(approach, settle)
+        if hit_tick is None:
+            continue
+        hits += 1
+        knockback += moved
+        if wall_tick is not None:
+            walls += 1
+            to_wall += wall_tick - hit_tick
+
+    return dict(params, **{
+        "matches": len(approaches),
+        "hit%": 100 * hits / len(approaches),
+        "knockback": knockback / hits if hits else 0.0,
+        "wall%": 100 * walls / hits if hits else 0.0,
+        "to_wall": to_wall / walls if walls else 0.0,
+    })
+
+
+# --- driver ---
+def parse_grid(items):
+    grid = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if name not in PARAMS:
+            raise SystemExit(f"unknown parameter {name!r} (one of: {', '.join(PARAMS)})")
+        grid[name] = [float(v) if "." in v else int(v) for v in values.split(",")]
+    return grid
+
+
+def print_table(rows, names):
+    cols = list(names) + list(METRICS)
+    widths = [max(len(c), 9) for c in cols]
+    print("  ".join(c.rjust(w) for c, w in zip(cols, widths)))
+    for row in rows:
+        cells = [f"{row[c]:g}" for c in names] + [f"{row[c]:.1f}" if isinstance(row[c], float) else str(row[c])
+                                                 for c in METRICS]
+        print("  ".join(cell.rjust(w) for cell, w in zip(cells, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grid", nargs="+", metavar="NAME=V1,V2,...",
+                        help="values to sweep; names: " + ", ".join(PARAMS))
+    parser.add_argument("--character", choices=sorted(CHARACTERS), default="player")
+    parser.add_argument("--approach", type=int, nargs=3, default=(10, 90, 1), metavar=("FROM", "TO", "STEP"),
+                        help="ticks of walking in before the bump, one match each")
+    parser.add_argument("--settle", type=int, default=180, help="ticks to let the dummy land after the bump")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (1 = run in this process)")
+    parser.add_argument("--out", metavar="CSV", help="also write the table here")
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid) if args.grid else DEFAULT_GRID
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    approaches = list(range(*args.approach))
+    print(f"{len(combos)} combinations x {len(approaches)} matches")
+
+    if args.jobs <= 1 or len(combos) <= 1:
+        init_worker(args.character)
+        rows = [run_combo(c, approaches, args.settle) for c in combos]
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker,
+                                 initargs=(args.character,)) as pool:
+            rows = list(pool.map(run_combo, combos, [approaches] * len(combos), [args.settle] * len(combos)))
+
+    print_table(rows, names)
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=names + list(METRICS))
+            writer.writeheader()
+            writer.writerows(rows)
+        print("saved", args.out)
+
+
+if __name__ == "__main__":
+    main()
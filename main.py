@@ -1,6 +1,81 @@
 #NerdB01/Baudm0n
+import argparse
+import os
+import time
 from assets.src.game import GAME
+from assets.src.config import REPLAY_DIR, NETPLAY_PORT
+from assets.src.replay import ReplayRecorder, ReplayPlayer
+from assets.src.controls import Keyboard, soak_script
+from assets.src.netplay import RollbackSession, UdpTransport
+from assets.src.hotreload import HotReload
 
 if __name__ == "__main__":
-    main = GAME()
-    main.Loop()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headless", action="store_true",
+                        help="no window/audio, scripted input, uncapped sim (soak tests)")
+    parser.add_argument("--ticks", type=int, default=0,
+                        help="with --headless: run this many sim ticks then exit (0 = forever)")
+    parser.add_argument("--stress", type=int, default=0, metavar="N",
+                        help="spawn N extra dummies (batched physics) to see how frame time scales")
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="cProfile the first N frames (ticks with --headless), same as F3 in game")
+    parser.add_argument("--profile-mem", action="store_true",
+                        help="with --profile: also write a tracemalloc diff over the same window")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save a replay here (windowed runs always record, to %s/)" % REPLAY_DIR)
+    parser.add_argument("--replay", metavar="PATH", help="watch a recorded match")
+    parser.add_argument("--seek", type=int, default=0, metavar="TICK",
+                        help="with --replay: start at this sim tick")
+    parser.add_argument("--netplay", metavar="HOST:PORT",
+                        help="rollback netplay against the cabinet at HOST:PORT (PLAYER vs BigBoy)")
+    parser.add_argument("--port", type=int, default=NETPLAY_PORT, help="with --netplay: local UDP port")
+    parser.add_argument("--bind", default="", metavar="ADDR",
+                        help="with --netplay: local address to listen on (default: every interface)")
+    parser.add_argument("--side", type=int, choices=(0, 1), default=0,
+                        help="with --netplay: 0 = player 1 (PLAYER), 1 = player 2 (BigBoy); the cabinets must differ")
+    parser.add_argument("--watch", action="store_true",
+                        help="hot-reload sprites, assets/data/*.json and config.py while running")
+    parser.add_argument("--window", metavar="WxH",
+                        help="window size; the game renders at its own resolution and is scaled up once")
+    parser.add_argument("--filter", choices=("integer", "smooth"), default=None,
+                        help="upscale filter (default from config.SCALE_FILTER)")
+    parser.add_argument("--fullscreen", action="store_true")
+    args = parser.parse_args()
+
+    window = {}
+    if args.window:
+        window["window_size"] = tuple(int(v) for v in args.window.lower().split("x"))
+    if args.filter:
+        window["scale_filter"] = args.filter
+    if args.fullscreen:
+        window["fullscreen"] = True
+
+    if args.netplay:
+        host, port = args.netplay.rsplit(":", 1)
+        local = soak_script() if args.headless else Keyboard()
+        session = RollbackSession.attach(GAME, local, UdpTransport(args.port, (host, int(port)), args.bind),
+                                         side=args.side, headless=args.headless, stress=args.stress, **window)
+        main = session.game
+    elif args.replay:
+        player = ReplayPlayer(args.replay, headless=args.headless)
+        player.seek(args.seek)
+        main = player.game
+    else:
+        main = GAME(headless=args.headless, stress=args.stress, **window)
+        record = args.record
+        if record is None and not args.headless:
+            record = os.path.join(REPLAY_DIR, time.strftime("replay_%Y%m%d_%H%M%S.bbr"))
+        if record:
+            main.StartRecording(ReplayRecorder(record, stress=args.stress))
+    if args.watch:
+        main.hotreload = HotReload(main)
+    if args.profile:
+        main.StartCapture(args.profile, memory=args.profile_mem)
+    if args.headless and args.ticks:
+        start = time.perf_counter()
+        main.Run(args.ticks)
+        took = time.perf_counter() - start
+        print(f"{args.ticks} ticks in {took:.2f}s ({args.ticks / took:.0f} ticks/s)")
+        main.SaveReplay()
+    else:
+        main.Loop()